@@ -222,6 +222,17 @@ async def test_search_files_no_match():
     assert "no match" in r.output.lower()
 
 
+@pytest.mark.asyncio
+async def test_search_files_limit():
+    """search_files: limit caps the number of paths"""
+    await execute_tool("write_file", {"path": "limit_a.md", "content": "a"}, TEST_CTX)
+    await execute_tool("write_file", {"path": "limit_b.md", "content": "b"}, TEST_CTX)
+    
+    r = await execute_tool("search_files", {"pattern": "limit_*.md", "limit": 1}, TEST_CTX)
+    assert r.success
+    assert len(r.output.splitlines()) == 1
+
+
 # ============ search_text ============
 
 @pytest.mark.asyncio
@@ -242,6 +253,50 @@ async def test_search_text_no_match():
     assert "no match" in r.output.lower()
 
 
+@pytest.mark.asyncio
+async def test_search_text_literal():
+    """search_text: literal=True matches regex metacharacters as plain text"""
+    await execute_tool("write_file", {"path": "literal_test.txt", "content": "version 1x2\nversion 1.2"}, TEST_CTX)
+    
+    r = await execute_tool("search_text", {"pattern": "1.2", "path": TEST_DIR, "literal": True}, TEST_CTX)
+    assert r.success
+    assert "version 1.2" in r.output
+    assert "1x2" not in r.output
+
+
+@pytest.mark.asyncio
+async def test_search_text_regex_syntax():
+    """search_text: ( and | are regex operators, matching rg's syntax"""
+    await execute_tool("write_file", {"path": "regex_test.txt", "content": "def foo(x):\nalpha\nbeta"}, TEST_CTX)
+    
+    r = await execute_tool("search_text", {"pattern": "alpha|beta", "path": TEST_DIR}, TEST_CTX)
+    assert r.success
+    assert "alpha" in r.output and "beta" in r.output
+    
+    r = await execute_tool("search_text", {"pattern": "def foo(", "path": TEST_DIR}, TEST_CTX)
+    assert not r.success
+    
+    r = await execute_tool("search_text", {"pattern": "def foo(", "path": TEST_DIR, "literal": True}, TEST_CTX)
+    assert r.success
+    assert "def foo(x)" in r.output
+
+
+@pytest.mark.asyncio
+async def test_search_text_ripgrep_errors():
+    """search_text: with rg available, its exit code 2 is reported as an error"""
+    import subprocess
+    from unittest.mock import patch
+    
+    failed = subprocess.CompletedProcess([], 2, stdout="", stderr="regex parse error: unclosed group")
+    with patch("tools.files.shutil.which", return_value="/usr/bin/rg"), \
+            patch("tools.files.subprocess.run", return_value=failed) as run:
+        r = await execute_tool("search_text", {"pattern": "def foo(", "path": TEST_DIR}, TEST_CTX)
+    assert run.call_args[0][0][0] == "rg"
+    assert "-F" not in run.call_args[0][0]
+    assert not r.success
+    assert "regex parse error" in r.error
+
+
 # ============ list_directory ============
 
 @pytest.mark.asyncio
@@ -254,6 +309,18 @@ async def test_list_directory():
     assert "list_test.txt" in r.output
 
 
+@pytest.mark.asyncio
+async def test_list_directory_file():
+    """list_directory: a file path lists that single file"""
+    await execute_tool("write_file", {"path": "list_single.txt", "content": "abc"}, TEST_CTX)
+    
+    r = await execute_tool("list_directory", {"path": "list_single.txt"}, TEST_CTX)
+    assert r.success
+    assert r.output.startswith("-rw")
+    assert r.output.endswith("list_single.txt")
+    assert " 3 " in r.output
+
+
 @pytest.mark.asyncio
 async def test_list_directory_workspace_root_blocked():
     """list_directory: blocks workspace root"""
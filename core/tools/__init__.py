@@ -99,7 +99,8 @@ TOOL_DEFINITIONS = [
             "parameters": {
                 "type": "object",
                 "properties": {
-                    "pattern": {"type": "string", "description": "Glob pattern (e.g. **/*.py)"}
+                    "pattern": {"type": "string", "description": "Glob pattern (e.g. **/*.py)"},
+                    "limit": {"type": "integer", "description": "Max results (default 200)"}
                 },
                 "required": ["pattern"]
             }
@@ -109,13 +110,14 @@ TOOL_DEFINITIONS = [
         "type": "function",
         "function": {
             "name": "search_text",
-            "description": "Search text in files using grep.",
+            "description": "Search text in files using ripgrep. pattern is a Rust/PCRE-style regex: ( ) | + ? { } are operators, so escape them or set literal=true to match them as text.",
             "parameters": {
                 "type": "object",
                 "properties": {
                     "pattern": {"type": "string", "description": "Text/regex to search"},
                     "path": {"type": "string", "description": "Directory to search"},
-                    "ignore_case": {"type": "boolean", "description": "Case insensitive"}
+                    "ignore_case": {"type": "boolean", "description": "Case insensitive"},
+                    "literal": {"type": "boolean", "description": "Treat pattern as plain text, not regex (faster)"}
                 },
                 "required": ["pattern"]
             }
@@ -125,7 +127,7 @@ TOOL_DEFINITIONS = [
         "type": "function",
         "function": {
             "name": "list_directory",
-            "description": "List directory contents.",
+            "description": "List directory contents, one entry per line: mode, size in bytes, modification time, name (directories end with /). A file path lists just that file.",
             "parameters": {
                 "type": "object",
                 "properties": {
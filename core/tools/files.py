@@ -7,11 +7,20 @@ sys.path.insert(0, os_module.path.dirname(os_module.path.dirname(os_module.path.
 import os
 import re
 import glob as globlib
+from itertools import islice
+import shutil
+import stat
 import subprocess
+import time
 from security import is_sensitive_file
 from logger import tool_logger
 from models import ToolResult, ToolContext
 
+# Max paths returned by search_files / lines returned by search_text
+SEARCH_FILES_LIMIT = 200
+SEARCH_TEXT_LIMIT = 200
+_REGEX_META = re.compile(r"[.^$*+?()\[\]{}|\\]")
+
 
 def normalize_path(input_path: str, cwd: str) -> str:
     """Normalize path to user's workspace"""
@@ -171,24 +180,28 @@ async def tool_delete_file(args: dict, ctx: ToolContext) -> ToolResult:
 async def tool_search_files(args: dict, ctx: ToolContext) -> ToolResult:
     """Search files by glob pattern"""
     pattern = args.get("pattern", "")
+    limit = min(args.get("limit") or SEARCH_FILES_LIMIT, SEARCH_FILES_LIMIT)
     
     tool_logger.info(f"Searching files: {pattern}")
     
     try:
-        files = globlib.glob(os.path.join(ctx.cwd, pattern), recursive=True)
+        # Lazy glob: stop walking once `limit` matches are found
+        files = globlib.iglob(os.path.join(ctx.cwd, pattern), recursive=True)
         # Filter out node_modules and .git
-        files = [f for f in files if "node_modules" not in f and ".git" not in f]
-        result = "\n".join(files[:200]) if files else "(no matches)"
+        files = list(islice((f for f in files if "node_modules" not in f and ".git" not in f), limit))
+        result = "\n".join(files) if files else "(no matches)"
         return ToolResult(True, output=result)
     except Exception as e:
         return ToolResult(False, error=str(e))
 
 
 async def tool_search_text(args: dict, ctx: ToolContext) -> ToolResult:
-    """Search text in files"""
+    """Search text in files (ripgrep, falling back to grep)"""
     pattern = args.get("pattern", "")
     search_path = args.get("path", ctx.cwd)
     ignore_case = args.get("ignore_case", False)
+    # Patterns without regex metacharacters take the fixed-string fast path
+    literal = args.get("literal", False) or not _REGEX_META.search(pattern)
     
     if not search_path.startswith("/"):
         search_path = os.path.join(ctx.cwd, search_path)
@@ -196,14 +209,27 @@ async def tool_search_text(args: dict, ctx: ToolContext) -> ToolResult:
     tool_logger.info(f"Searching text: '{pattern}' in {search_path}")
     
     try:
-        flags = ["-rn"]
+        if shutil.which("rg"):
+            # Same scope as grep -r: hidden and gitignored files included
+            cmd = ["rg", "-n", "--no-heading", "--no-messages", "--max-columns=150",
+                   "--hidden", "--no-ignore", "-g", "!node_modules", "-g", "!.git"]
+        else:
+            cmd = ["grep", "-rn", "--exclude-dir=node_modules", "--exclude-dir=.git"]
         if ignore_case:
-            flags.append("-i")
-        flags.extend(["--exclude-dir=node_modules", "--exclude-dir=.git"])
+            cmd.append("-i")
+        if literal:
+            cmd.append("-F")
+        elif cmd[0] == "grep":
+            # Extended syntax so ( ) | + ? { } are operators, as in rg
+            cmd.append("-E")
+        cmd.extend(["-e", pattern, "--", search_path])
         
-        cmd = f"grep {' '.join(flags)} '{pattern}' '{search_path}' 2>/dev/null | head -200"
-        result = subprocess.run(cmd, shell=True, capture_output=True, text=True, timeout=30)
-        return ToolResult(True, output=result.stdout or "(no matches)")
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+        lines = result.stdout.splitlines()[:SEARCH_TEXT_LIMIT]
+        if result.returncode == 2 and not lines:
+            # Bad pattern or unreadable path - not the same as no matches
+            return ToolResult(False, error=result.stderr.strip() or "search failed")
+        return ToolResult(True, output="\n".join(lines) or "(no matches)")
     except Exception as e:
         return ToolResult(True, output="(no matches)")
 
@@ -221,7 +247,21 @@ async def tool_list_directory(args: dict, ctx: ToolContext) -> ToolResult:
     tool_logger.info(f"Listing: {path}")
     
     try:
-        result = subprocess.run(f"ls -la '{path}'", shell=True, capture_output=True, text=True, timeout=10)
-        return ToolResult(True, output=result.stdout or result.stderr)
+        # scandir + lstat in-process instead of spawning `ls -la`
+        if not os.path.isdir(path):
+            # A file lists as its own single entry, like `ls -la <file>`
+            return ToolResult(True, output=_listing_line(path, os.lstat(path)))
+        lines = []
+        with os.scandir(path) as entries:
+            for entry in sorted(entries, key=lambda e: e.name):
+                name = entry.name + "/" if entry.is_dir(follow_symlinks=False) else entry.name
+                lines.append(_listing_line(name, entry.stat(follow_symlinks=False)))
+        return ToolResult(True, output="\n".join(lines) or "(empty directory)")
     except Exception as e:
         return ToolResult(False, error=str(e))
+
+
+def _listing_line(name: str, st: os.stat_result) -> str:
+    """One list_directory line: mode, size, modification time, name"""
+    mtime = time.strftime("%Y-%m-%d %H:%M", time.localtime(st.st_mtime))
+    return f"{stat.filemode(st.st_mode)} {st.st_size:>10} {mtime} {name}"
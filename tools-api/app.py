@@ -8,10 +8,12 @@ Provides:
 - Dynamic tool loading
 """
 
+import asyncio
 from fastapi import FastAPI
 from contextlib import asynccontextmanager
 
-from src.mcp import mcp_cache
+from src.mcp import mcp_cache, get_client, close_client, keep_warm
+from src.responses import ORJSONResponse
 from src.skills import skills_manager
 from src.routes import tools_router, mcp_router, skills_router
 
@@ -24,19 +26,25 @@ async def lifespan(app: FastAPI):
     mcp_cache.load_cache()
     skills_manager.load_cache()
     skills_manager.scan_all()
+    await get_client()
+    warm_task = asyncio.create_task(keep_warm())
     print(f"[tools-api] Loaded {len(mcp_cache.tools)} MCP tools, {len(skills_manager.skills)} skills")
     
     yield
     
     # Shutdown
     print("[tools-api] Shutting down...")
+    warm_task.cancel()
+    mcp_cache.save_cache()  # flush a pending debounced write
+    await close_client()
 
 
 app = FastAPI(
     title="Tools API",
     version="3.0",
     description="Single source of truth for agent tools, MCP servers, and skills",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 
@@ -1,7 +1,7 @@
 """Configuration management for tools"""
 
 import os
-import json
+import orjson
 from typing import Optional
 
 # Config file path
@@ -12,8 +12,8 @@ def load_config() -> dict:
     """Load tool configuration (enabled/disabled state)"""
     if os.path.exists(CONFIG_FILE):
         try:
-            with open(CONFIG_FILE) as f:
-                return json.load(f)
+            with open(CONFIG_FILE, 'rb') as f:
+                return orjson.loads(f.read())
         except:
             pass
     return {}
@@ -22,8 +22,10 @@ def load_config() -> dict:
 def save_config(config: dict):
     """Save tool configuration"""
     os.makedirs(os.path.dirname(CONFIG_FILE), exist_ok=True)
-    with open(CONFIG_FILE, 'w') as f:
-        json.dump(config, f, indent=2)
+    tmp_path = CONFIG_FILE + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(orjson.dumps(config))
+    os.replace(tmp_path, CONFIG_FILE)
 
 
 def get_all_tools_with_state(
@@ -44,8 +46,7 @@ def get_all_tools_with_state(
             "enabled": enabled
         }
     
-    # MCP tools from cache
-    mcp_cache.load_cache()
+    # MCP tools from the in-memory cache (loaded at startup, kept current by the MCP routes)
     for name, tool in mcp_cache.tools.items():
         enabled = config.get(name, {}).get("enabled", tool.get("enabled", True))
         tools[name] = {
@@ -1,16 +1,31 @@
 """MCP (Model Context Protocol) support"""
 
 import os
-import json
+import time
+import asyncio
 import httpx
-from typing import Dict, List, Optional, Any
+import orjson
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, List, Optional, Any, Set, Tuple
 from datetime import datetime
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 
 # Config paths
 MCP_CONFIG_FILE = "/data/mcp_servers.json"
 MCP_TOOLS_CACHE = "/data/mcp_tools_cache.json"
 
+# Delay before a scheduled tools cache write (seconds)
+SAVE_DEBOUNCE = 1.0
+
+# Idle pooled connections are kept this long; keep_warm() pings more often (seconds)
+KEEPALIVE_EXPIRY = 120.0
+KEEPALIVE_INTERVAL = 60.0
+
+# Per-request timeouts (seconds)
+FETCH_TIMEOUT = 15.0
+CALL_TIMEOUT = 60.0
+
 
 class MCPServer(BaseModel):
     """MCP Server configuration"""
@@ -20,6 +35,7 @@ class MCPServer(BaseModel):
     transport: str = "http"  # http, stdio, sse
     api_key: Optional[str] = None
     description: Optional[str] = None
+    cache_ttl: Optional[float] = None  # seconds before cached tools are revalidated
 
 
 class MCPToolsCache:
@@ -29,33 +45,91 @@ class MCPToolsCache:
         self.tools: Dict[str, dict] = {}
         self.last_refresh: Optional[datetime] = None
         self.server_status: Dict[str, dict] = {}
+        self._tools_by_server: Dict[str, Set[str]] = defaultdict(set)
+        # server -> time.monotonic() of the last fetch attempt in this process
+        self.refreshed_at: Dict[str, float] = {}
+        self._dirty = False
+        self._flush_task: Optional[asyncio.Task] = None
+    
+    def _reindex(self):
+        """Rebuild the server -> tool names index from self.tools"""
+        self._tools_by_server = defaultdict(set)
+        for name, tool in self.tools.items():
+            self._tools_by_server[tool.get("server")].add(name)
     
     def load_cache(self):
         """Load cached tools from file"""
         if os.path.exists(MCP_TOOLS_CACHE):
             try:
-                with open(MCP_TOOLS_CACHE) as f:
-                    data = json.load(f)
+                with open(MCP_TOOLS_CACHE, 'rb') as f:
+                    data = orjson.loads(f.read())
                     self.tools = data.get("tools", {})
                     self.last_refresh = datetime.fromisoformat(data["last_refresh"]) if data.get("last_refresh") else None
                     self.server_status = data.get("server_status", {})
+                    self._seed_refreshed_at()
+                    self._reindex()
+                    self._dirty = False
             except:
                 pass
     
+    def _seed_refreshed_at(self):
+        """refreshed_at from the persisted last_refresh times, so a restart doesn't make every server stale"""
+        now, wall = time.monotonic(), datetime.now()
+        for name, status in self.server_status.items():
+            try:
+                age = (wall - datetime.fromisoformat(status["last_refresh"])).total_seconds()
+            except (KeyError, TypeError, ValueError):
+                continue
+            self.refreshed_at[name] = now - max(age, 0.0)
+    
     def save_cache(self):
-        """Save tools cache to file"""
+        """Save tools cache to file (no-op if nothing changed since the last save)"""
+        if not self._dirty:
+            return
         os.makedirs(os.path.dirname(MCP_TOOLS_CACHE), exist_ok=True)
-        with open(MCP_TOOLS_CACHE, 'w') as f:
-            json.dump({
+        # Write to a temp file and rename so a crash mid-write keeps the old cache
+        tmp_path = MCP_TOOLS_CACHE + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(orjson.dumps({
                 "tools": self.tools,
                 "last_refresh": self.last_refresh.isoformat() if self.last_refresh else None,
                 "server_status": self.server_status
-            }, f, indent=2)
+            }, option=orjson.OPT_NON_STR_KEYS))
+        os.replace(tmp_path, MCP_TOOLS_CACHE)
+        self._dirty = False
+    
+    def schedule_save(self):
+        """Save after SAVE_DEBOUNCE seconds, coalescing bursts of updates into one write"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.save_cache()
+            return
+        if self._flush_task and not self._flush_task.done() and self._flush_task.get_loop() is loop:
+            return
+        self._flush_task = loop.create_task(self._flush_later())
+    
+    async def _flush_later(self):
+        await asyncio.sleep(SAVE_DEBOUNCE)
+        self.save_cache()
+    
+    def set_server_status(self, server_name: str, status: Optional[dict]):
+        """Set (or remove, if status is None) the status entry for a server"""
+        if status is None:
+            self.server_status.pop(server_name, None)
+            self.refreshed_at.pop(server_name, None)
+        else:
+            self.server_status[server_name] = status
+        self._dirty = True
     
     def add_tools(self, server_name: str, tools: List[dict]):
-        """Add tools from an MCP server"""
+        """Add tools from an MCP server (call save_cache()/schedule_save() to persist)"""
         for tool in tools:
             tool_name = f"mcp_{server_name}_{tool['name']}"
+            previous = self.tools.get(tool_name)
+            if previous and previous.get("server") != server_name:
+                self._tools_by_server[previous.get("server")].discard(tool_name)
+            self._tools_by_server[server_name].add(tool_name)
             self.tools[tool_name] = {
                 "name": tool_name,
                 "original_name": tool["name"],
@@ -66,165 +140,361 @@ class MCPToolsCache:
                 "enabled": True
             }
         self.last_refresh = datetime.now()
-        self.save_cache()
+        self.refreshed_at[server_name] = time.monotonic()
+        self._dirty = True
+    
+    def tool_count(self, server_name: str) -> int:
+        """Number of cached tools from a server"""
+        return len(self._tools_by_server.get(server_name, ()))
     
     def clear_server_tools(self, server_name: str):
-        """Remove all tools from a specific server"""
-        to_remove = [name for name, tool in self.tools.items() if tool.get("server") == server_name]
+        """Remove all tools from a specific server (call save_cache()/schedule_save() to persist)"""
+        to_remove = self._tools_by_server.pop(server_name, ())
         for name in to_remove:
-            del self.tools[name]
-        self.save_cache()
+            self.tools.pop(name, None)
+        if to_remove:
+            self._dirty = True
 
 
 # Global MCP cache
 mcp_cache = MCPToolsCache()
 
 
+# Parses/validates and serializes the whole config file in one pydantic-core call
+_servers_adapter = TypeAdapter(Dict[str, MCPServer])
+
+# Parsed config keyed on the file's mtime: (st_mtime_ns, servers)
+_config_cache: Optional[Tuple[int, Dict[str, MCPServer]]] = None
+
+
 def load_mcp_config() -> Dict[str, MCPServer]:
-    """Load MCP server configurations"""
-    if os.path.exists(MCP_CONFIG_FILE):
-        try:
-            with open(MCP_CONFIG_FILE) as f:
-                data = json.load(f)
-                return {name: MCPServer(**server) for name, server in data.items()}
-        except:
-            pass
-    return {}
+    """Load MCP server configurations (re-parsed only when the file changes)"""
+    global _config_cache
+    try:
+        mtime_ns = os.stat(MCP_CONFIG_FILE).st_mtime_ns
+    except FileNotFoundError:
+        return {}
+    if _config_cache is not None and _config_cache[0] == mtime_ns:
+        return dict(_config_cache[1])
+    try:
+        with open(MCP_CONFIG_FILE, 'rb') as f:
+            servers = _servers_adapter.validate_json(f.read())
+    except:
+        return {}
+    _config_cache = (mtime_ns, servers)
+    return dict(servers)
 
 
 def save_mcp_config(servers: Dict[str, MCPServer]):
     """Save MCP server configurations"""
+    global _config_cache
     os.makedirs(os.path.dirname(MCP_CONFIG_FILE), exist_ok=True)
-    with open(MCP_CONFIG_FILE, 'w') as f:
-        json.dump({name: server.model_dump() for name, server in servers.items()}, f, indent=2)
+    tmp_path = MCP_CONFIG_FILE + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(_servers_adapter.dump_json(servers))
+    os.replace(tmp_path, MCP_CONFIG_FILE)
+    # Write-through so the next load doesn't re-read what we just wrote
+    _config_cache = (os.stat(MCP_CONFIG_FILE).st_mtime_ns, dict(servers))
+
+
+# Shared HTTP client - keeps connections to MCP servers alive between calls
+_client: Optional[httpx.AsyncClient] = None
+
+
+async def get_client() -> httpx.AsyncClient:
+    """Get the shared pooled HTTP client (created on first use)"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=httpx.Timeout(connect=5.0, read=CALL_TIMEOUT, write=10.0, pool=5.0),
+            limits=httpx.Limits(max_keepalive_connections=50, max_connections=200, keepalive_expiry=KEEPALIVE_EXPIRY),
+            http2=True
+        )
+    return _client
+
+
+async def close_client():
+    """Close the shared HTTP client (app shutdown)"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+_SSE_DATA = b"data:"
+
+
+def _loads_dict(payload) -> Optional[dict]:
+    """orjson-decode payload, None unless it is a JSON object"""
+    try:
+        data = orjson.loads(payload)
+    except orjson.JSONDecodeError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+class _MessageStream:
+    """JSON-RPC messages read from a streamed MCP response.
+
+    The raw bytes are split into lines with bytes.find. Per the SSE format,
+    "data:" lines (one optional space after the colon) are collected until
+    a blank line ends the event, which is then decoded and yielded, so
+    callers can stop reading at the first useful one. CRLF line endings are
+    accepted; comments (":...") and other fields (event:, id:, retry:) are
+    skipped without being decoded. A body without any "data:" line, or one
+    sent as application/json, is parsed as a single plain JSON object once
+    the stream ends.
+    """
+
+    def __init__(self, response: httpx.Response):
+        self.response = response
+        self.buf = bytearray()
+        self.pos = 0  # start of the first unscanned line in buf
+        self.saw_data = False
+        self.data_lines: List[Tuple[int, int]] = []  # payload spans of the pending event
+
+    @property
+    def preview(self) -> str:
+        return bytes(self.buf[:300]).decode("utf-8", "replace")
+
+    def _dispatch(self):
+        """Decode the pending event"""
+        lines, self.data_lines = self.data_lines, []
+        if len(lines) == 1:
+            # Common case: parse straight from the buffer. The view is
+            # released before yielding so the buffer can still be resized.
+            view = memoryview(self.buf)
+            try:
+                data = _loads_dict(view[lines[0][0]:lines[0][1]])
+            finally:
+                view.release()
+            if data is not None:
+                yield data
+        elif lines:
+            data = _loads_dict(b"\n".join(self.buf[start:end] for start, end in lines))
+            if data is not None:
+                yield data
+                return
+            # Not one multi-line payload: servers that omit the blank line
+            # between events send one complete message per data line
+            for start, end in lines:
+                data = _loads_dict(bytes(self.buf[start:end]))
+                if data is not None:
+                    yield data
+
+    def _scan(self):
+        buf = self.buf
+        while True:
+            end = buf.find(b"\n", self.pos)
+            if end == -1:
+                break
+            start, self.pos = self.pos, end + 1
+            if end > start and buf[end - 1] == 0x0D:  # CRLF
+                end -= 1
+            if start == end:
+                yield from self._dispatch()
+            elif buf.startswith(_SSE_DATA, start):
+                self.saw_data = True
+                start += len(_SSE_DATA)
+                if start < end and buf[start] == 0x20:
+                    start += 1
+                self.data_lines.append((start, end))
+        if self.saw_data and not self.data_lines and self.pos:
+            # SSE confirmed and no event pending: drop scanned lines, the
+            # JSON fallback won't need them
+            del buf[:self.pos]
+            self.pos = 0
+
+    async def __aiter__(self):
+        if self.response.headers.get("content-type", "").startswith("application/json"):
+            # Declared plain JSON: nothing to scan, decode once at the end
+            async for chunk in self.response.aiter_bytes():
+                self.buf += chunk
+            data = _loads_dict(self.buf)
+            if data is not None:
+                yield data
+            return
+        async for chunk in self.response.aiter_bytes():
+            self.buf += chunk
+            for data in self._scan():
+                yield data
+        if not self.buf.endswith(b"\n"):
+            self.buf += b"\n"
+            for data in self._scan():
+                yield data
+        # An unterminated last event still counts
+        for data in self._dispatch():
+            yield data
+        if not self.saw_data and self.buf.strip():
+            data = _loads_dict(self.buf)
+            if data is not None:
+                yield data
+
+
+# Static JSON-RPC request bodies, serialized once (headers carry Content-Type)
+_INITIALIZE_BODY = orjson.dumps({
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "2024-11-05",
+        "capabilities": {},
+        "clientInfo": {"name": "topsha-tools-api", "version": "1.0"}
+    }
+})
+_PING_BODY = orjson.dumps({"jsonrpc": "2.0", "id": 3, "method": "ping"})
+# tools/list uses id 2 after a session initialize, id 1 on the legacy path
+_TOOLS_LIST_BODIES = {
+    request_id: orjson.dumps({"jsonrpc": "2.0", "id": request_id, "method": "tools/list", "params": {}})
+    for request_id in (1, 2)
+}
+
+
+@lru_cache(maxsize=64)
+def _request_headers(api_key: Optional[str]) -> Dict[str, str]:
+    """Headers for every MCP request to a server with this api_key (shared - don't mutate)"""
+    headers = {
+        "Accept": "application/json, text/event-stream",
+        "Content-Type": "application/json"
+    }
+    if api_key:
+        headers["Authorization"] = f"Bearer {api_key}"
+    return headers
+
+
+async def _initialize(client: httpx.AsyncClient, server: MCPServer, headers: dict, timeout: float) -> Tuple[int, Optional[str]]:
+    """Send initialize; return (status, session id from the header or the first message)
+    
+    The response is streamed so an SSE reply that stays open after its
+    first event doesn't hold us up.
+    """
+    async with client.stream(
+        "POST",
+        server.url,
+        content=_INITIALIZE_BODY,
+        headers=headers,
+        timeout=timeout
+    ) as response:
+        session_id = response.headers.get("mcp-session-id")
+        if response.status_code != 200:
+            await response.aread()
+            print(f"[MCP {server.name}] initialize status={response.status_code} body={response.text[:500]}")
+        elif not session_id:
+            async for data in _MessageStream(response):
+                result = data.get("result")
+                session_id = (result.get("sessionId") if isinstance(result, dict) else None) or data.get("sessionId")
+                break
+            if not session_id:
+                print(f"[MCP {server.name}] initialize OK but no mcp-session-id (header or body), using legacy path")
+        return response.status_code, session_id
+
+
+def _server_key(server: MCPServer) -> Tuple[str, Optional[str]]:
+    """(url, api_key): servers sharing an endpoint but not a token get separate sessions"""
+    return server.url, server.api_key
+
+
+# Session ids from initialize, reused by fetch_mcp_tools/call_mcp_tool:
+# (url, api_key) -> (session_id, expires_at)
+# A None session id means the server answered initialize without one (legacy).
+_session_cache: Dict[Tuple[str, Optional[str]], Tuple[Optional[str], float]] = {}
+SESSION_TTL = 300.0
+_session_locks: Dict[Tuple[str, Optional[str]], asyncio.Lock] = {}
+# Statuses that mean the cached session is gone and initialize must be redone
+_SESSION_EXPIRED_STATUSES = (400, 401, 404)
+
+
+async def _get_session_id(client: httpx.AsyncClient, server: MCPServer, headers: dict, timeout: float) -> Tuple[Optional[str], bool]:
+    """Return (session_id, from_cache), running initialize on a cache miss"""
+    key = _server_key(server)
+    cached = _session_cache.get(key)
+    if cached and cached[1] > time.monotonic():
+        return cached[0], True
+
+    # One initialize per server at a time; concurrent callers reuse its result
+    lock = _session_locks.setdefault(key, asyncio.Lock())
+    async with lock:
+        cached = _session_cache.get(key)
+        if cached and cached[1] > time.monotonic():
+            return cached[0], False
+
+        status, session_id = await _initialize(client, server, headers, timeout)
+        if status == 200:
+            _session_cache[key] = (session_id, time.monotonic() + SESSION_TTL)
+        return session_id, False
+
+
+# In-flight tools/list fetches, keyed by (url, api_key); concurrent callers share one
+_tool_fetches: Dict[Tuple[str, Optional[str]], asyncio.Future] = {}
 
 
 async def fetch_mcp_tools(server: MCPServer) -> List[dict]:
-    """Fetch tools from an MCP server"""
+    """Fetch tools from an MCP server
+    
+    Concurrent fetches for the same server (e.g. a refresh racing a
+    background revalidation) share a single upstream request.
+    """
+    key = _server_key(server)
+    fetch = _tool_fetches.get(key)
+    if fetch is None:
+        fetch = asyncio.ensure_future(_fetch_mcp_tools(server))
+        _tool_fetches[key] = fetch
+        fetch.add_done_callback(lambda _: _tool_fetches.pop(key, None))
+    # Shielded: one caller timing out must not cancel the fetch for the others
+    return await asyncio.shield(fetch)
+
+
+async def _fetch_mcp_tools(server: MCPServer) -> List[dict]:
     if server.transport == "http":
         try:
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                headers = {
-                    "Accept": "application/json, text/event-stream",
-                    "Content-Type": "application/json"
-                }
-                if server.api_key:
-                    headers["Authorization"] = f"Bearer {server.api_key}"
-                    print(f"[MCP {server.name}] requesting with Bearer auth")
-                else:
-                    print(f"[MCP {server.name}] requesting without auth (no token configured)")
-
-                # Try Streamable HTTP MCP first (requires session)
-                # Step 1: Initialize session
-                init_response = await client.post(
-                    server.url,
-                    json={
-                        "jsonrpc": "2.0",
-                        "id": 1,
-                        "method": "initialize",
-                        "params": {
-                            "protocolVersion": "2024-11-05",
-                            "capabilities": {},
-                            "clientInfo": {"name": "topsha-tools-api", "version": "1.0"}
-                        }
-                    },
-                    headers=headers
-                )
-                if init_response.status_code != 200:
-                    print(f"[MCP {server.name}] initialize status={init_response.status_code} body={init_response.text[:500]}")
-                session_id = init_response.headers.get("mcp-session-id")
-                if not session_id and init_response.status_code == 200:
-                    try:
-                        init_body = init_response.json()
-                        session_id = init_body.get("result", {}).get("sessionId") or init_body.get("sessionId")
-                    except Exception:
-                        pass
-                if not session_id and init_response.status_code == 200:
-                    print(f"[MCP {server.name}] initialize OK but no mcp-session-id (header or body), using legacy path")
+            client = await get_client()
+            headers = _request_headers(server.api_key)
+            if server.api_key:
+                print(f"[MCP {server.name}] requesting with Bearer auth")
+            else:
+                print(f"[MCP {server.name}] requesting without auth (no token configured)")
 
+            for attempt in range(2):
+                # Step 1: Streamable HTTP MCP session (initialize, cached per server)
+                session_id, from_cache = await _get_session_id(client, server, headers, FETCH_TIMEOUT)
                 if session_id:
-                    # Streamable HTTP MCP - use session ID
-                    headers["mcp-session-id"] = session_id
-                    response = await client.post(
-                        server.url,
-                        json={
-                            "jsonrpc": "2.0",
-                            "id": 2,
-                            "method": "tools/list",
-                            "params": {}
-                        },
-                        headers=headers
-                    )
-
-                    if response.status_code == 200:
-                        text = response.text.strip()
-                        # Parse SSE: lines "data: { ... }"
-                        for line in text.split("\n"):
-                            s = line.strip()
-                            if s.startswith("data:"):
-                                payload = s[5:].strip()
-                                if not payload:
-                                    continue
-                                try:
-                                    data = json.loads(payload)
-                                    if "result" in data and "tools" in data["result"]:
-                                        return data["result"]["tools"]
-                                except json.JSONDecodeError:
-                                    pass
-                        # Fallback: single JSON object (some streamable servers)
-                        try:
-                            data = json.loads(text)
-                            if "result" in data and "tools" in data["result"]:
-                                return data["result"]["tools"]
-                            if "tools" in data:
-                                return data["tools"]
-                        except json.JSONDecodeError:
-                            pass
-                        print(f"[MCP {server.name}] tools/list SSE/JSON: no result.tools (len={len(text)}) preview: {text[:200]!r}")
-                    else:
-                        print(f"[MCP {server.name}] tools/list status={response.status_code} body={response.text[:500]}")
+                    list_headers = {**headers, "mcp-session-id": session_id}
+                    request_id = 2
                 else:
                     # Simple JSON-RPC (legacy MCP servers)
-                    response = await client.post(
-                        server.url,
-                        json={
-                            "jsonrpc": "2.0",
-                            "id": 1,
-                            "method": "tools/list",
-                            "params": {}
-                        },
-                        headers=headers
-                    )
+                    list_headers = headers
+                    request_id = 1
 
-                    if response.status_code == 200:
-                        raw = response.text
-                        if not raw or not raw.strip():
-                            print(f"[MCP {server.name}] tools/list empty response body")
-                        else:
-                            # Try plain JSON first (single JSON-RPC object)
-                            try:
-                                data = json.loads(raw)
-                                if "result" in data and "tools" in data["result"]:
-                                    return data["result"]["tools"]
-                                if "tools" in data:
-                                    return data["tools"]
-                                if "error" in data:
-                                    print(f"[MCP {server.name}] tools/list JSON-RPC error: {data['error']}")
-                                else:
-                                    print(f"[MCP {server.name}] tools/list unexpected JSON keys: {list(data.keys())[:10]}")
-                            except json.JSONDecodeError:
-                                # Maybe SSE format (one JSON per "data: " line)
-                                for line in raw.split("\n"):
-                                    if line.startswith("data: "):
-                                        try:
-                                            data = json.loads(line[6:])
-                                            if "result" in data and "tools" in data["result"]:
-                                                return data["result"]["tools"]
-                                        except json.JSONDecodeError:
-                                            pass
-                                print(f"[MCP {server.name}] tools/list invalid JSON and no SSE data. body preview: {raw[:300]!r}")
-                    else:
+                # Step 2: List tools. The body is either SSE ("data: {...}" lines)
+                # or a single JSON object; read it as a stream and stop at the
+                # first message that carries the tool list.
+                async with client.stream(
+                    "POST",
+                    server.url,
+                    content=_TOOLS_LIST_BODIES[request_id],
+                    headers=list_headers,
+                    timeout=FETCH_TIMEOUT
+                ) as response:
+                    if response.status_code in _SESSION_EXPIRED_STATUSES and from_cache and attempt == 0:
+                        # Stale session - forget it and re-initialize once
+                        _session_cache.pop(_server_key(server), None)
+                        continue
+                    if response.status_code != 200:
+                        await response.aread()
                         print(f"[MCP {server.name}] tools/list status={response.status_code} body={response.text[:500]}")
+                        return []
+
+                    messages = _MessageStream(response)
+                    async for data in messages:
+                        result = data.get("result")
+                        if isinstance(result, dict) and "tools" in result:
+                            return result["tools"]
+                        if "tools" in data:
+                            return data["tools"]
+                        if "error" in data:
+                            print(f"[MCP {server.name}] tools/list JSON-RPC error: {data['error']}")
+                    print(f"[MCP {server.name}] tools/list SSE/JSON: no result.tools, body preview: {messages.preview!r}")
+                    return []
         except Exception as e:
             print(f"[MCP {server.name}] Error fetching tools: {e}")
     
@@ -235,73 +505,94 @@ async def call_mcp_tool(server: MCPServer, tool_name: str, arguments: dict) -> d
     """Call a tool on an MCP server"""
     if server.transport == "http":
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                headers = {
-                    "Accept": "application/json, text/event-stream",
-                    "Content-Type": "application/json"
+            client = await get_client()
+            headers = _request_headers(server.api_key)
+            
+            # Serialized once, reused if the call is retried on a fresh session
+            body = orjson.dumps({
+                "jsonrpc": "2.0",
+                "id": 2,
+                "method": "tools/call",
+                "params": {
+                    "name": tool_name,
+                    "arguments": arguments
                 }
-                if server.api_key:
-                    headers["Authorization"] = f"Bearer {server.api_key}"
-                
-                # Step 1: Initialize session (for Streamable HTTP MCP)
-                init_response = await client.post(
-                    server.url,
-                    json={
-                        "jsonrpc": "2.0",
-                        "id": 1,
-                        "method": "initialize",
-                        "params": {
-                            "protocolVersion": "2024-11-05",
-                            "capabilities": {},
-                            "clientInfo": {"name": "topsha-tools-api", "version": "1.0"}
-                        }
-                    },
-                    headers=headers
-                )
+            })
+            
+            for attempt in range(2):
+                # Step 1: Initialize session (for Streamable HTTP MCP), cached per server
+                session_id, from_cache = await _get_session_id(client, server, headers, CALL_TIMEOUT)
+                call_headers = {**headers, "mcp-session-id": session_id} if session_id else headers
                 
-                session_id = init_response.headers.get("mcp-session-id")
-                if session_id:
-                    headers["mcp-session-id"] = session_id
-                
-                # Step 2: Call tool
-                response = await client.post(
+                # Step 2: Call tool (SSE or plain JSON, first result/error wins)
+                async with client.stream(
+                    "POST",
                     server.url,
-                    json={
-                        "jsonrpc": "2.0",
-                        "id": 2,
-                        "method": "tools/call",
-                        "params": {
-                            "name": tool_name,
-                            "arguments": arguments
-                        }
-                    },
-                    headers=headers
-                )
-                
-                if response.status_code == 200:
-                    text = response.text
-                    # Try SSE format first
-                    for line in text.split('\n'):
-                        if line.startswith('data: '):
-                            try:
-                                data = json.loads(line[6:])
-                                if "result" in data:
-                                    return {"success": True, "result": data["result"]}
-                                if "error" in data:
-                                    return {"success": False, "error": data["error"]}
-                            except:
-                                pass
-                    # Try plain JSON
-                    try:
-                        data = response.json()
-                        if "result" in data:
-                            return {"success": True, "result": data["result"]}
-                        if "error" in data:
-                            return {"success": False, "error": data["error"]}
-                    except:
-                        pass
-                return {"success": False, "error": f"HTTP {response.status_code}"}
+                    content=body,
+                    headers=call_headers,
+                    timeout=CALL_TIMEOUT
+                ) as response:
+                    if response.status_code in _SESSION_EXPIRED_STATUSES and from_cache and attempt == 0:
+                        # Stale session - forget it and re-initialize once
+                        _session_cache.pop(_server_key(server), None)
+                        continue
+                    if response.status_code == 200:
+                        async for data in _MessageStream(response):
+                            if "result" in data:
+                                return {"success": True, "result": data["result"]}
+                            if "error" in data:
+                                return {"success": False, "error": data["error"]}
+                    return {"success": False, "error": f"HTTP {response.status_code}"}
         except Exception as e:
             return {"success": False, "error": str(e)}
     
     return {"success": False, "error": f"Unsupported transport: {server.transport}"}
+
+
+async def _ping(client: httpx.AsyncClient, server: MCPServer) -> bool:
+    """Keep a server's session and connection from idling out; False if initialize failed"""
+    headers = _request_headers(server.api_key)
+    session_id, from_cache = await _get_session_id(client, server, headers, FETCH_TIMEOUT)
+    if _server_key(server) not in _session_cache:
+        return False  # initialize didn't succeed
+    if not session_id:
+        return True  # legacy server: no session to keep alive, and ping may be unsupported
+    headers = {**headers, "mcp-session-id": session_id}
+    async with client.stream(
+        "POST",
+        server.url,
+        content=_PING_BODY,
+        headers=headers,
+        timeout=FETCH_TIMEOUT
+    ) as response:
+        await response.aread()  # read to the end so the connection goes back to the pool
+        if response.status_code in _SESSION_EXPIRED_STATUSES:
+            _session_cache.pop(_server_key(server), None)
+        elif response.status_code == 200 and from_cache:
+            _session_cache[_server_key(server)] = (session_id, time.monotonic() + SESSION_TTL)
+    return True
+
+
+async def keep_warm():
+    """Ping enabled HTTP servers every KEEPALIVE_INTERVAL (the first pass after one interval)
+
+    Servers marked disconnected are skipped until a refresh or revalidation
+    reconnects them, so an unreachable server isn't re-initialized every
+    interval. Runs for the app's lifetime (started and cancelled by the lifespan).
+    """
+    client = await get_client()
+    while True:
+        await asyncio.sleep(KEEPALIVE_INTERVAL)
+        servers = [
+            s for s in load_mcp_config().values()
+            if s.enabled and s.transport == "http"
+            and mcp_cache.server_status.get(s.name, {}).get("connected") is not False
+        ]
+        results = await asyncio.gather(*(_ping(client, server) for server in servers), return_exceptions=True)
+        failed = [server for server, ok in zip(servers, results) if ok is not True]
+        for server in failed:
+            # Merged, not replaced: tool_count/last_refresh still describe the cached tools
+            status = {**mcp_cache.server_status.get(server.name, {}), "connected": False, "error": "Keep-alive failed"}
+            mcp_cache.set_server_status(server.name, status)
+        if failed:
+            mcp_cache.schedule_save()
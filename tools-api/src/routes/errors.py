@@ -0,0 +1,8 @@
+"""Shared error responses for route handlers"""
+
+from ..responses import ORJSONResponse
+
+
+def not_found(kind: str, name: str) -> ORJSONResponse:
+    """404 with the same body HTTPException would produce, without raising"""
+    return ORJSONResponse(status_code=404, content={"detail": f"{kind} {name} not found"})
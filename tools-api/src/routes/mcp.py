@@ -1,8 +1,10 @@
 """MCP server management routes"""
 
+import time
+import asyncio
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from typing import Optional
+from typing import Dict, Optional
 from datetime import datetime
 
 from ..mcp import (
@@ -10,21 +12,63 @@ from ..mcp import (
     load_mcp_config, save_mcp_config,
     fetch_mcp_tools, call_mcp_tool
 )
+from .errors import not_found
 
 router = APIRouter(prefix="/mcp", tags=["mcp"])
 
+# Upper bound for a single server's fetch during refresh-all (seconds)
+REFRESH_ALL_TIMEOUT = 30.0
+# Servers fetched at the same time during refresh-all
+REFRESH_ALL_CONCURRENCY = 8
+
+# Cached tools older than this are served as-is and revalidated in the
+# background (MCPServer.cache_ttl overrides it per server)
+CACHE_MAX_AGE = 30.0
+
+# In-flight background revalidations, one per server
+_revalidations: Dict[str, asyncio.Task] = {}
+
+
+async def _revalidate(name: str, server: MCPServer):
+    """Refetch a server's tools; on failure keep serving the old ones"""
+    try:
+        tools = await asyncio.wait_for(fetch_mcp_tools(server), REFRESH_ALL_TIMEOUT)
+    except Exception:
+        tools = []
+    current = load_mcp_config().get(name)
+    if current is None or not current.enabled:
+        return  # removed or disabled while we were fetching
+    if tools:
+        mcp_cache.clear_server_tools(name)
+        mcp_cache.add_tools(name, tools)
+        mcp_cache.set_server_status(name, {"connected": True, "tool_count": len(tools), "last_refresh": datetime.now().isoformat()})
+    else:
+        mcp_cache.refreshed_at[name] = time.monotonic()
+    mcp_cache.schedule_save()
+
+
+def _schedule_revalidation(name: str, server: MCPServer):
+    """Start a background revalidation unless one is already running"""
+    task = _revalidations.get(name)
+    if task and not task.done():
+        return
+    _revalidations[name] = asyncio.create_task(_revalidate(name, server))
+
 
 @router.get("/servers")
 async def list_mcp_servers():
     """List all configured MCP servers. api_key is never returned; api_key_set indicates if one is configured."""
     servers = load_mcp_config()
-    mcp_cache.load_cache()
+    now = time.monotonic()
 
     result = []
     for name, server in servers.items():
+        # Stale-while-revalidate: answer from memory, refresh stale servers behind the response
+        if server.enabled and now - mcp_cache.refreshed_at.get(name, float("-inf")) > (server.cache_ttl or CACHE_MAX_AGE):
+            _schedule_revalidation(name, server)
         d = server.model_dump(exclude={"api_key"})
         d["api_key_set"] = bool(server.api_key)
-        d["tool_count"] = len([t for t in mcp_cache.tools.values() if t.get("server") == name])
+        d["tool_count"] = mcp_cache.tool_count(name)
         d["status"] = mcp_cache.server_status.get(name, {})
         result.append(d)
     return {"servers": result}
@@ -36,6 +80,7 @@ class MCPServerCreate(BaseModel):
     transport: str = "http"
     api_key: Optional[str] = None
     description: Optional[str] = None
+    cache_ttl: Optional[float] = None
 
 
 @router.post("/servers")
@@ -51,7 +96,8 @@ async def add_mcp_server(data: MCPServerCreate):
         url=data.url,
         transport=data.transport,
         api_key=data.api_key,
-        description=data.description
+        description=data.description,
+        cache_ttl=data.cache_ttl
     )
     
     servers[data.name] = server
@@ -61,7 +107,8 @@ async def add_mcp_server(data: MCPServerCreate):
     tools = await fetch_mcp_tools(server)
     if tools:
         mcp_cache.add_tools(data.name, tools)
-        mcp_cache.server_status[data.name] = {"connected": True, "tool_count": len(tools)}
+        mcp_cache.set_server_status(data.name, {"connected": True, "tool_count": len(tools)})
+        mcp_cache.schedule_save()
     
     return {"success": True, "name": data.name, "tools_loaded": len(tools) if tools else 0}
 
@@ -72,16 +119,15 @@ async def remove_mcp_server(name: str):
     servers = load_mcp_config()
     
     if name not in servers:
-        raise HTTPException(404, f"Server {name} not found")
+        return not_found("Server", name)
     
     del servers[name]
     save_mcp_config(servers)
     
     # Clear cached tools
     mcp_cache.clear_server_tools(name)
-    if name in mcp_cache.server_status:
-        del mcp_cache.server_status[name]
-    mcp_cache.save_cache()
+    mcp_cache.set_server_status(name, None)
+    mcp_cache.schedule_save()
     
     return {"success": True, "name": name}
 
@@ -96,9 +142,14 @@ async def toggle_mcp_server(name: str, data: MCPServerToggle):
     servers = load_mcp_config()
     
     if name not in servers:
-        raise HTTPException(404, f"Server {name} not found")
+        return not_found("Server", name)
+    
+    if servers[name].enabled == data.enabled:
+        # No-op toggle (UIs resending state): skip the config write and the fetch
+        return {"success": True, "name": name, "enabled": data.enabled}
     
-    servers[name].enabled = data.enabled
+    # Copy rather than mutate: the server objects are shared with the config cache
+    servers[name] = servers[name].model_copy(update={"enabled": data.enabled})
     save_mcp_config(servers)
     
     if data.enabled:
@@ -106,13 +157,13 @@ async def toggle_mcp_server(name: str, data: MCPServerToggle):
         tools = await fetch_mcp_tools(servers[name])
         if tools:
             mcp_cache.add_tools(name, tools)
-            mcp_cache.server_status[name] = {"connected": True, "tool_count": len(tools)}
+            mcp_cache.set_server_status(name, {"connected": True, "tool_count": len(tools)})
     else:
         # Clear tools when disabling
         mcp_cache.clear_server_tools(name)
-        mcp_cache.server_status[name] = {"connected": False, "disabled": True}
+        mcp_cache.set_server_status(name, {"connected": False, "disabled": True, "tool_count": 0})
     
-    mcp_cache.save_cache()
+    mcp_cache.schedule_save()
     
     return {"success": True, "name": name, "enabled": data.enabled}
 
@@ -123,7 +174,7 @@ async def refresh_mcp_server(name: str):
     servers = load_mcp_config()
     
     if name not in servers:
-        raise HTTPException(404, f"Server {name} not found")
+        return not_found("Server", name)
     
     server = servers[name]
     
@@ -134,10 +185,10 @@ async def refresh_mcp_server(name: str):
     tools = await fetch_mcp_tools(server)
     if tools:
         mcp_cache.add_tools(name, tools)
-        mcp_cache.server_status[name] = {"connected": True, "tool_count": len(tools), "last_refresh": datetime.now().isoformat()}
+        mcp_cache.set_server_status(name, {"connected": True, "tool_count": len(tools), "last_refresh": datetime.now().isoformat()})
     else:
-        mcp_cache.server_status[name] = {"connected": False, "error": "Failed to fetch tools"}
-    mcp_cache.save_cache()
+        mcp_cache.set_server_status(name, {"connected": False, "error": "Failed to fetch tools"})
+    mcp_cache.schedule_save()
     
     return {"success": True, "name": name, "tools_loaded": len(tools)}
 
@@ -148,19 +199,38 @@ async def refresh_all_mcp_servers():
     servers = load_mcp_config()
     results = {}
     
-    for name, server in servers.items():
-        if server.enabled:
-            mcp_cache.clear_server_tools(name)
-            tools = await fetch_mcp_tools(server)
-            if tools:
-                mcp_cache.add_tools(name, tools)
-                mcp_cache.server_status[name] = {"connected": True, "tool_count": len(tools)}
-                results[name] = {"success": True, "tools": len(tools)}
-            else:
-                mcp_cache.server_status[name] = {"connected": False}
-                results[name] = {"success": False, "error": "Failed to fetch tools"}
-    
-    mcp_cache.save_cache()
+    # Fetch from enabled servers concurrently (at most REFRESH_ALL_CONCURRENCY
+    # at a time), then apply results serially. Each fetch is bounded so one
+    # slow server can't hold up the whole response.
+    enabled = [(name, server) for name, server in servers.items() if server.enabled]
+    limit = asyncio.Semaphore(REFRESH_ALL_CONCURRENCY)
+    
+    async def fetch_one(server: MCPServer):
+        async with limit:
+            return await asyncio.wait_for(fetch_mcp_tools(server), REFRESH_ALL_TIMEOUT)
+    
+    fetched = await asyncio.gather(
+        *(fetch_one(server) for _, server in enabled),
+        return_exceptions=True
+    )
+    
+    for (name, server), tools in zip(enabled, fetched):
+        mcp_cache.clear_server_tools(name)
+        if isinstance(tools, asyncio.TimeoutError):
+            mcp_cache.set_server_status(name, {"connected": False})
+            results[name] = {"success": False, "error": f"Timed out after {REFRESH_ALL_TIMEOUT:g}s"}
+        elif isinstance(tools, BaseException):
+            mcp_cache.set_server_status(name, {"connected": False})
+            results[name] = {"success": False, "error": str(tools)}
+        elif tools:
+            mcp_cache.add_tools(name, tools)
+            mcp_cache.set_server_status(name, {"connected": True, "tool_count": len(tools)})
+            results[name] = {"success": True, "tools": len(tools)}
+        else:
+            mcp_cache.set_server_status(name, {"connected": False})
+            results[name] = {"success": False, "error": "Failed to fetch tools"}
+    
+    mcp_cache.schedule_save()
     
     return {"results": results}
 
@@ -171,7 +241,7 @@ async def call_mcp_tool_endpoint(server_name: str, tool_name: str, arguments: di
     servers = load_mcp_config()
     
     if server_name not in servers:
-        raise HTTPException(404, f"Server {server_name} not found")
+        return not_found("Server", server_name)
     
     server = servers[server_name]
     result = await call_mcp_tool(server, tool_name, arguments)
@@ -2,28 +2,68 @@
 
 import os
 import shutil
-import subprocess
+import asyncio
+import tarfile
+import tempfile
+import httpx
+import orjson
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import Optional
 
-from ..skills import skills_manager, Skill, ANTHROPIC_SKILLS, SHARED_SKILLS_DIR
+from ..skills import skills_manager, Skill, ANTHROPIC_SKILLS, SHARED_SKILLS_DIR, read_frontmatter_description
 from ..config import load_config, save_config
+from .errors import not_found
 
 router = APIRouter(prefix="/skills", tags=["skills"])
 
+_ANTHROPIC_SKILL_NAMES = frozenset(ANTHROPIC_SKILLS)
+_ANTHROPIC_SKILL_KEY_LIST = sorted(ANTHROPIC_SKILLS)
+
+SKILLS_TARBALL_URL = "https://codeload.github.com/anthropics/skills/tar.gz/refs/heads/main"
+DOWNLOAD_TIMEOUT = 60.0
+
+
+async def _download(url: str, path: str):
+    """Stream url to a local file without holding the body in memory"""
+    async with httpx.AsyncClient(timeout=DOWNLOAD_TIMEOUT, follow_redirects=True) as client:
+        async with client.stream("GET", url) as resp:
+            resp.raise_for_status()
+            with open(path, 'wb') as f:
+                async for chunk in resp.aiter_bytes():
+                    f.write(chunk)
+
+
+def _extract_skill(archive: str, name: str, dest: str) -> bool:
+    """Extract skills/{name}/ from the repo tarball into dest, False if absent
+    
+    Members are stored as "<repo>-<ref>/skills/{name}/..."; everything else
+    in the archive is skipped.
+    """
+    prefix = f"skills/{name}/"
+    found = False
+    with tarfile.open(archive, "r|gz") as tar:
+        for member in tar:
+            rel = member.name.split("/", 1)[-1]
+            if not rel.startswith(prefix) or not (member.isfile() or member.isdir()):
+                continue
+            member.name = rel[len(prefix):]
+            tar.extract(member, dest, filter="data")
+            found = True
+    return found
+
 
 @router.get("")
 async def list_skills(user_id: Optional[str] = None):
-    """List all loaded skills"""
-    skills_manager.scan_all(user_id)
+    """List all loaded skills (metadata from skill.json, prompts not loaded)"""
+    skills = skills_manager.scan_metadata_lightweight(user_id)
     
     skills_list = []
-    for key, skill in skills_manager.skills.items():
+    for key, skill in skills.items():
         skills_list.append({
             "key": key,
             **skill.dict(),
-            "tool_count": len([t for t in skills_manager.skill_tools.values() if t.get("skill") == skill.name])
+            "tool_count": len(skill.tools) if skill.enabled else 0
         })
     
     return {
@@ -39,12 +79,12 @@ async def get_skill_mentions_endpoint(user_id: Optional[str] = None):
     Returns only skill names and descriptions.
     Agent should use list_directory/read_file to load full instructions.
     """
-    skills_manager.scan_all(user_id)
-    mentions = skills_manager.get_skill_mentions()
+    skills = skills_manager.scan_metadata_lightweight(user_id)
+    mentions = skills_manager.get_skill_mentions(skills)
     
     return {
         "mentions": mentions,
-        "skill_count": len(skills_manager.skills)
+        "skill_count": len(skills)
     }
 
 
@@ -66,6 +106,7 @@ async def get_all_skill_prompts_endpoint(user_id: Optional[str] = None):
 @router.post("/scan")
 async def scan_skills_endpoint(user_id: Optional[str] = None):
     """Force rescan of all skill directories"""
+    skills_manager.invalidate()
     skills_manager.scan_all(user_id)
     
     return {
@@ -79,8 +120,7 @@ async def scan_skills_endpoint(user_id: Optional[str] = None):
 @router.get("/available")
 async def list_available_skills_endpoint():
     """List skills available for installation from Anthropic"""
-    skills_manager.scan_all()
-    installed = {s.name for s in skills_manager.skills.values()}
+    installed = skills_manager.installed_names()
     
     available = []
     for name, desc in ANTHROPIC_SKILLS.items():
@@ -101,10 +141,10 @@ async def get_skill(name: str, user_id: Optional[str] = None):
     skill = skills_manager.get_skill(name)
     
     if not skill:
-        raise HTTPException(404, f"Skill {name} not found")
+        return not_found("Skill", name)
     
     # Get tools from this skill
-    skill_tools = [t for t in skills_manager.skill_tools.values() if t.get("skill") == skill.name]
+    skill_tools = skills_manager.get_skill_tools(skill.name)
     
     return {
         "skill": skill.dict(),
@@ -119,7 +159,7 @@ async def get_skill_prompt(name: str, user_id: Optional[str] = None):
     skill = skills_manager.get_skill(name)
     
     if not skill:
-        raise HTTPException(404, f"Skill {name} not found")
+        return not_found("Skill", name)
     
     return {
         "name": skill.name,
@@ -138,9 +178,10 @@ async def toggle_skill(name: str, data: SkillToggle, user_id: Optional[str] = No
     skill = skills_manager.get_skill(name)
     
     if not skill:
-        raise HTTPException(404, f"Skill {name} not found")
+        return not_found("Skill", name)
     
-    skill.enabled = data.enabled
+    skills_manager.set_enabled(skill, data.enabled)
+    skills_manager.scan_all(user_id)
     skills_manager.save_cache()
     
     return {"success": True, "name": name, "enabled": data.enabled}
@@ -160,8 +201,8 @@ async def install_skill(data: SkillInstall):
     name = data.name.lower()
     
     if data.source == "anthropic":
-        if name not in ANTHROPIC_SKILLS:
-            raise HTTPException(400, f"Unknown skill: {name}. Available: {list(ANTHROPIC_SKILLS.keys())}")
+        if name not in _ANTHROPIC_SKILL_NAMES:
+            raise HTTPException(400, f"Unknown skill: {name}. Available: {_ANTHROPIC_SKILL_KEY_LIST}")
         
         skill_path = os.path.join(SHARED_SKILLS_DIR, name)
         
@@ -169,66 +210,55 @@ async def install_skill(data: SkillInstall):
         if os.path.exists(skill_path):
             return {"success": True, "name": name, "message": f"Skill '{name}' already installed", "path": skill_path}
         
-        # Clone from Anthropic's repository
+        # Download the repository tarball and extract just this skill
+        temp_dir = tempfile.mkdtemp(prefix=f"anthropic-skills-{name}-")
         try:
-            # Create temp directory for clone
-            temp_dir = f"/tmp/anthropic-skills-{name}"
-            if os.path.exists(temp_dir):
-                shutil.rmtree(temp_dir)
-            
-            # Sparse checkout just the skill we need
-            subprocess.run([
-                "git", "clone", "--depth", "1", "--filter=blob:none", "--sparse",
-                "https://github.com/anthropics/skills.git",
-                temp_dir
-            ], check=True, capture_output=True)
+            archive = os.path.join(temp_dir, "skills.tar.gz")
+            staging = os.path.join(temp_dir, name)
+            await _download(SKILLS_TARBALL_URL, archive)
             
-            subprocess.run([
-                "git", "-C", temp_dir, "sparse-checkout", "set", f"skills/{name}"
-            ], check=True, capture_output=True)
+            if not await asyncio.to_thread(_extract_skill, archive, name, staging):
+                raise HTTPException(500, f"Skill '{name}' not found in Anthropic's repository")
             
             # Move to skills directory
             os.makedirs(SHARED_SKILLS_DIR, exist_ok=True)
-            src_path = os.path.join(temp_dir, "skills", name)
+            shutil.move(staging, skill_path)
             
-            if os.path.exists(src_path):
-                shutil.move(src_path, skill_path)
-                
-                # Create skill.json if it doesn't exist (use SKILL.md as system_prompt_file)
-                skill_json_path = os.path.join(skill_path, "skill.json")
-                if not os.path.exists(skill_json_path):
-                    skill_md_path = os.path.join(skill_path, "SKILL.md")
-                    desc = ANTHROPIC_SKILLS.get(name, "")
-                    
-                    skill_json = {
-                        "name": name,
-                        "description": desc,
-                        "version": "1.0.0",
-                        "author": "Anthropic",
-                        "system_prompt_file": "SKILL.md" if os.path.exists(skill_md_path) else None,
-                        "tools": [],
-                        "enabled": True
-                    }
-                    
-                    with open(skill_json_path, 'w') as f:
-                        import json
-                        json.dump(skill_json, f, indent=2)
-                
-                # Cleanup
-                shutil.rmtree(temp_dir, ignore_errors=True)
+            # Create skill.json if it doesn't exist (use SKILL.md as system_prompt_file)
+            skill_json_path = os.path.join(skill_path, "skill.json")
+            if not os.path.exists(skill_json_path):
+                skill_md_path = os.path.join(skill_path, "SKILL.md")
+                desc = read_frontmatter_description(skill_md_path) or ANTHROPIC_SKILLS.get(name, "")
                 
-                # Rescan skills
-                skills_manager.scan_all()
+                skill_json = {
+                    "name": name,
+                    "description": desc,
+                    "version": "1.0.0",
+                    "author": "Anthropic",
+                    "system_prompt_file": "SKILL.md" if os.path.exists(skill_md_path) else None,
+                    "tools": [],
+                    "enabled": True
+                }
                 
-                return {"success": True, "name": name, "message": f"Installed skill '{name}'", "path": skill_path}
-            else:
-                shutil.rmtree(temp_dir, ignore_errors=True)
-                raise HTTPException(500, f"Skill '{name}' not found in Anthropic's repository")
-                
-        except subprocess.CalledProcessError as e:
-            raise HTTPException(500, f"Installation failed: {e.stderr.decode() if e.stderr else str(e)}")
+                with open(skill_json_path, 'wb') as f:
+                    f.write(orjson.dumps(skill_json, option=orjson.OPT_INDENT_2))
+            
+            # Rescan skills
+            skills_manager.invalidate()
+            skills_manager.scan_all()
+            
+            return {"success": True, "name": name, "message": f"Installed skill '{name}'", "path": skill_path}
+        
+        except HTTPException:
+            raise
+        except httpx.TimeoutException:
+            raise HTTPException(504, f"Installation timed out after {DOWNLOAD_TIMEOUT:.0f}s")
+        except httpx.HTTPError as e:
+            raise HTTPException(502, f"Installation failed: {e}")
         except Exception as e:
             raise HTTPException(500, f"Installation failed: {str(e)}")
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
     
     else:
         raise HTTPException(400, f"Unknown source: {data.source}")
@@ -240,9 +270,10 @@ async def uninstall_skill(name: str):
     skill_path = os.path.join(SHARED_SKILLS_DIR, name)
     
     if not os.path.exists(skill_path):
-        raise HTTPException(404, f"Skill {name} not found")
+        return not_found("Skill", name)
     
     shutil.rmtree(skill_path)
+    skills_manager.invalidate()
     skills_manager.scan_all()
     
     return {"success": True, "name": name, "message": f"Uninstalled skill '{name}'"}
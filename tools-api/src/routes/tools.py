@@ -2,9 +2,10 @@
 
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from typing import Optional
+from functools import lru_cache
+from typing import Optional, Tuple
 
-from ..tools import get_all_tools as get_builtin_tools, BOT_ONLY_TOOLS
+from ..tools import get_all_tools as get_builtin_tools, to_openai_format, BOT_ONLY_TOOLS_ORDERED
 from ..mcp import mcp_cache
 from ..skills import skills_manager
 from ..config import load_config, save_config, get_all_tools_with_state
@@ -12,6 +13,12 @@ from ..config import load_config, save_config, get_all_tools_with_state
 router = APIRouter(tags=["tools"])
 
 
+@lru_cache(maxsize=1024)
+def _search_text(name: str, description: str) -> Tuple[str, str]:
+    """Lowercased name/description, kept across searches"""
+    return name.lower(), description.lower()
+
+
 @router.get("/tools")
 async def list_all_tools(user_id: Optional[str] = None):
     """Get all tools with their definitions and state"""
@@ -24,7 +31,7 @@ async def list_all_tools(user_id: Optional[str] = None):
     
     return {
         "tools": list(tools.values()),
-        "bot_only_tools": BOT_ONLY_TOOLS,
+        "bot_only_tools": BOT_ONLY_TOOLS_ORDERED,
         "stats": {
             "builtin": builtin_count,
             "mcp": mcp_count,
@@ -46,14 +53,7 @@ async def get_enabled_tools(user_id: Optional[str] = None):
     
     for tool in tools.values():
         if tool["enabled"]:
-            enabled.append({
-                "type": "function",
-                "function": {
-                    "name": tool["name"],
-                    "description": tool["description"],
-                    "parameters": tool["parameters"]
-                }
-            })
+            enabled.append(to_openai_format(tool))
     
     return {"tools": enabled, "count": len(enabled)}
 
@@ -72,25 +72,17 @@ async def search_tools(query: str = "", source: str = "all", limit: int = 10):
     
     query_lower = query.lower().strip()
     query_words = query_lower.split() if query_lower else []
+    source_prefix = {"builtin": "builtin", "mcp": "mcp:", "skill": "skill:"}.get(source)
     
     for tool in tools.values():
         # Filter by source
-        if source != "all":
-            tool_source = tool.get("source", "builtin")
-            if source == "builtin" and not tool_source.startswith("builtin"):
-                continue
-            if source == "mcp" and not tool_source.startswith("mcp:"):
-                continue
-            if source == "skill" and not tool_source.startswith("skill:"):
-                continue
+        if source_prefix and not tool.get("source", "builtin").startswith(source_prefix):
+            continue
         
         # Calculate relevance score
-        if not query_lower:
-            score = 0
-        else:
-            score = 0
-            name_lower = tool["name"].lower()
-            desc_lower = tool.get("description", "").lower()
+        score = 0
+        if query_lower:
+            name_lower, desc_lower = _search_text(tool["name"], tool.get("description", ""))
             
             # Exact name match
             if name_lower == query_lower:
@@ -113,27 +105,25 @@ async def search_tools(query: str = "", source: str = "all", limit: int = 10):
             if score == 0:
                 continue
         
-        results.append({
-            **tool,
-            "_score": score
-        })
+        results.append((score, tool))
     
     # Sort by score (descending), then by name
-    results.sort(key=lambda x: (-x.get("_score", 0), x["name"]))
+    results.sort(key=lambda x: (-x[0], x[1]["name"]))
     
     # Apply limit
     if limit > 0:
         results = results[:limit]
     
     # Format for agent consumption
-    formatted = []
-    for tool in results:
-        formatted.append({
+    formatted = [
+        {
             "name": tool["name"],
             "description": tool.get("description", ""),
             "source": tool.get("source", "builtin"),
-            "score": tool.get("_score", 0)
-        })
+            "score": score
+        }
+        for score, tool in results
+    ]
     
     return {"tools": formatted, "count": len(formatted), "total_available": len(tools)}
 
@@ -165,14 +155,7 @@ async def get_base_tools():
     for name in BASE_TOOL_NAMES:
         if name in tools and tools[name].get("enabled", True):
             tool = tools[name]
-            base_tools.append({
-                "type": "function",
-                "function": {
-                    "name": tool["name"],
-                    "description": tool["description"],
-                    "parameters": tool["parameters"]
-                }
-            })
+            base_tools.append(to_openai_format(tool))
     
     return {"tools": base_tools, "count": len(base_tools)}
 
@@ -191,14 +174,7 @@ async def load_toolkit(names: list[str]):
     for name in names:
         if name in tools and tools[name].get("enabled", True):
             tool = tools[name]
-            loaded.append({
-                "type": "function",
-                "function": {
-                    "name": tool["name"],
-                    "description": tool["description"],
-                    "parameters": tool["parameters"]
-                }
-            })
+            loaded.append(to_openai_format(tool))
         else:
             not_found.append(name)
     
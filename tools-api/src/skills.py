@@ -1,8 +1,12 @@
 """Skills management - Anthropic-style skill system"""
 
 import os
-import json
-from typing import Dict, List, Optional
+import re
+import mmap
+import orjson
+from collections import OrderedDict, defaultdict
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Tuple
 from datetime import datetime
 from pydantic import BaseModel
 
@@ -11,6 +15,9 @@ SKILLS_CACHE = "/data/skills_cache.json"
 WORKSPACE_ROOT = os.environ.get("WORKSPACE_ROOT", "/workspace")
 SHARED_SKILLS_DIR = "/data/skills"
 
+# Per-user scan results kept in memory (least recently used are dropped)
+MAX_CACHED_SCANS = 256
+
 # Available skills from Anthropic's repository
 ANTHROPIC_SKILLS = {
     "pptx": "Create PowerPoint presentations",
@@ -31,6 +38,57 @@ ANTHROPIC_SKILLS = {
     "web-artifacts-builder": "Build web artifacts"
 }
 
+# `description:` line of a SKILL.md YAML frontmatter
+_FRONTMATTER_DESC = re.compile(rb'^description:[ \t]*(.*?)[ \t]*\r?$', re.MULTILINE)
+
+
+def read_frontmatter_description(path: str) -> Optional[str]:
+    """description from a SKILL.md frontmatter, without reading the whole file"""
+    try:
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # Only the leading ---...--- block; the markdown body is not searched
+            if mm[:3] != b'---':
+                return None
+            end = mm.find(b'\n---', 3)
+            if end == -1:
+                return None
+            match = _FRONTMATTER_DESC.search(mm, 0, end)
+            value = match.group(1) if match else None
+    except (OSError, ValueError):  # missing or empty file
+        return None
+    if not value:
+        return None
+    # Strip a matching pair of outer quotes only; apostrophes inside stay
+    if len(value) >= 2 and value[:1] in (b'"', b"'") and value[-1:] == value[:1]:
+        value = value[1:-1]
+    return value.decode("utf-8", "replace").strip() or None
+
+
+@lru_cache(maxsize=256)
+def _read_skill_prompt(path: str, mtime_ns: int) -> str:
+    """Prompt file contents; mtime_ns is part of the cache key so edits are re-read"""
+    with open(path) as f:
+        return f.read()
+
+
+@lru_cache(maxsize=256)
+def _prompt_file_name(skill_file: str, mtime_ns: int) -> Optional[str]:
+    """system_prompt_file named in a skill.json; mtime_ns keys the cache like above"""
+    try:
+        with open(skill_file, 'rb') as f:
+            return orjson.loads(f.read()).get("system_prompt_file")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def load_skill_prompt(path: str) -> Optional[str]:
+    """Read a skill's system_prompt_file, None if it doesn't exist"""
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    return _read_skill_prompt(path, mtime_ns)
+
 
 class Skill(BaseModel):
     """Skill definition - like Anthropic's Skills"""
@@ -51,6 +109,14 @@ class Skill(BaseModel):
     path: Optional[str] = None
 
 
+def _remember(cache: OrderedDict, key, value):
+    """Store value as the most recent entry, dropping the oldest past MAX_CACHED_SCANS"""
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > MAX_CACHED_SCANS:
+        cache.popitem(last=False)
+
+
 class SkillsManager:
     """Manages skills loaded from user workspaces and shared directory"""
     
@@ -58,13 +124,21 @@ class SkillsManager:
         self.skills: Dict[str, Skill] = {}
         self.skill_tools: Dict[str, dict] = {}  # Flattened tools from all skills
         self.last_scan: Optional[datetime] = None
+        # user_id -> (directory signature, skills, skill_tools, last_scan)
+        self._scan_cache: "OrderedDict[Optional[str], Tuple[tuple, Dict[str, Skill], Dict[str, dict], datetime]]" = OrderedDict()
+        # user_id -> (directory signature, metadata-only skills)
+        self._metadata_cache: "OrderedDict[Optional[str], Tuple[tuple, Dict[str, Skill]]]" = OrderedDict()
+        # (skills dict it was built from, names) for installed_names()
+        self._installed_names: Optional[Tuple[Dict[str, Skill], FrozenSet[str]]] = None
+        # (skill_tools dict it was built from, skill name -> its tools)
+        self._tools_by_skill: Optional[Tuple[Dict[str, dict], Dict[str, List[dict]]]] = None
     
     def load_cache(self):
         """Load skills cache from file"""
         if os.path.exists(SKILLS_CACHE):
             try:
-                with open(SKILLS_CACHE) as f:
-                    data = json.load(f)
+                with open(SKILLS_CACHE, 'rb') as f:
+                    data = orjson.loads(f.read())
                     for name, skill_data in data.get("skills", {}).items():
                         self.skills[name] = Skill(**skill_data)
                     self.skill_tools = data.get("skill_tools", {})
@@ -75,15 +149,21 @@ class SkillsManager:
     def save_cache(self):
         """Save skills cache to file"""
         os.makedirs(os.path.dirname(SKILLS_CACHE), exist_ok=True)
-        with open(SKILLS_CACHE, 'w') as f:
-            json.dump({
-                "skills": {name: skill.dict() for name, skill in self.skills.items()},
+        tmp_path = SKILLS_CACHE + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(orjson.dumps({
+                "skills": {name: skill.model_dump() for name, skill in self.skills.items()},
                 "skill_tools": self.skill_tools,
                 "last_scan": self.last_scan.isoformat() if self.last_scan else None
-            }, f, indent=2)
+            }))
+        os.replace(tmp_path, SKILLS_CACHE)
     
-    def scan_directory(self, directory: str, source: str = "user") -> List[Skill]:
-        """Scan directory for skill.json files"""
+    def scan_directory(self, directory: str, source: str = "user", load_prompts: bool = True) -> List[Skill]:
+        """Scan directory for skill.json files
+        
+        With load_prompts=False only skill.json is read - system_prompt_file
+        (SKILL.md) is left unopened and system_prompt stays as in skill.json.
+        """
         found_skills = []
         
         if not os.path.exists(directory):
@@ -96,16 +176,15 @@ class SkillsManager:
             
             if os.path.isdir(skill_dir) and os.path.exists(skill_file):
                 try:
-                    with open(skill_file) as f:
-                        data = json.load(f)
+                    with open(skill_file, 'rb') as f:
+                        data = orjson.loads(f.read())
                         
                         # Load system_prompt from file if specified
                         system_prompt = data.get("system_prompt")
-                        if data.get("system_prompt_file"):
-                            prompt_file = os.path.join(skill_dir, data["system_prompt_file"])
-                            if os.path.exists(prompt_file):
-                                with open(prompt_file) as pf:
-                                    system_prompt = pf.read()
+                        if load_prompts and data.get("system_prompt_file"):
+                            prompt = load_skill_prompt(os.path.join(skill_dir, data["system_prompt_file"]))
+                            if prompt is not None:
+                                system_prompt = prompt
                         
                         skill = Skill(
                             name=data.get("name", item),
@@ -135,10 +214,101 @@ class SkillsManager:
         """Scan shared skills directory"""
         return self.scan_directory(SHARED_SKILLS_DIR, source="shared")
     
+    def _scan_signature(self, user_id: Optional[str] = None) -> tuple:
+        """mtimes of the scanned directories, each skill.json and its system_prompt_file"""
+        dirs = [SHARED_SKILLS_DIR]
+        if user_id:
+            dirs.append(os.path.join(WORKSPACE_ROOT, user_id, "skills"))
+        
+        signature = []
+        for directory in dirs:
+            try:
+                signature.append(os.stat(directory).st_mtime_ns)
+                entries = sorted(os.listdir(directory))
+            except OSError:
+                signature.append(None)
+                continue
+            for item in entries:
+                skill_file = os.path.join(directory, item, "skill.json")
+                try:
+                    mtime = os.stat(skill_file).st_mtime_ns
+                except OSError:
+                    continue
+                prompt_mtime = None
+                prompt_file = _prompt_file_name(skill_file, mtime)
+                if prompt_file:
+                    try:
+                        prompt_mtime = os.stat(os.path.join(directory, item, prompt_file)).st_mtime_ns
+                    except OSError:
+                        pass
+                signature.append((item, mtime, prompt_mtime))
+        return tuple(signature)
+    
+    def set_enabled(self, skill: Skill, enabled: bool):
+        """Enable/disable a skill in its skill.json, so the change survives rescans"""
+        skill_file = os.path.join(skill.path, "skill.json")
+        with open(skill_file, 'rb') as f:
+            data = orjson.loads(f.read())
+        data["enabled"] = enabled
+        tmp_path = skill_file + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        os.replace(tmp_path, skill_file)
+        skill.enabled = enabled
+        self.invalidate()
+    
+    def invalidate(self):
+        """Force the next scan to re-read skill directories"""
+        self._scan_cache.clear()
+        self._metadata_cache.clear()
+        self._installed_names = None
+    
+    def scan_metadata_lightweight(self, user_id: Optional[str] = None) -> Dict[str, Skill]:
+        """Skills keyed like scan_all(), built from skill.json alone
+        
+        For listings that need name/description/version/author/tools but not
+        the system prompt. Does not touch self.skills / self.skill_tools.
+        """
+        signature = self._scan_signature(user_id)
+        # Own cache only: scan_all()'s skills carry system prompts and are self.skills
+        cached = self._metadata_cache.get(user_id)
+        if cached and cached[0] == signature:
+            self._metadata_cache.move_to_end(user_id)
+            return cached[1]
+        
+        skills = {}
+        for skill in self.scan_directory(SHARED_SKILLS_DIR, source="shared", load_prompts=False):
+            skills[f"shared:{skill.name}"] = skill
+        if user_id:
+            user_skills_dir = os.path.join(WORKSPACE_ROOT, user_id, "skills")
+            for skill in self.scan_directory(user_skills_dir, source=f"user:{user_id}", load_prompts=False):
+                skills[f"user:{skill.name}"] = skill
+        
+        _remember(self._metadata_cache, user_id, (signature, skills))
+        return skills
+    
+    def installed_names(self) -> FrozenSet[str]:
+        """Names of shared skills, rebuilt only when the shared scan changes"""
+        skills = self.scan_metadata_lightweight()
+        if self._installed_names is None or self._installed_names[0] is not skills:
+            self._installed_names = (skills, frozenset(s.name for s in skills.values()))
+        return self._installed_names[1]
+    
     def scan_all(self, user_id: Optional[str] = None):
-        """Scan all skill sources and update cache"""
-        self.skills.clear()
-        self.skill_tools.clear()
+        """Scan all skill sources and update cache
+        
+        Skipped when no skill directory, skill.json or system_prompt_file
+        changed since the last scan for this user_id.
+        """
+        signature = self._scan_signature(user_id)
+        cached = self._scan_cache.get(user_id)
+        if cached and cached[0] == signature:
+            self._scan_cache.move_to_end(user_id)
+            _, self.skills, self.skill_tools, self.last_scan = cached
+            return
+        
+        self.skills = {}
+        self.skill_tools = {}
         
         # 1. Load shared skills
         for skill in self.scan_shared_skills():
@@ -165,6 +335,7 @@ class SkillsManager:
                     }
         
         self.last_scan = datetime.now()
+        _remember(self._scan_cache, user_id, (signature, self.skills, self.skill_tools, self.last_scan))
         self.save_cache()
     
     def get_skill(self, name: str) -> Optional[Skill]:
@@ -178,6 +349,15 @@ class SkillsManager:
                 return skill
         return None
     
+    def get_skill_tools(self, skill_name: str) -> List[dict]:
+        """Flattened tools provided by one skill"""
+        if self._tools_by_skill is None or self._tools_by_skill[0] is not self.skill_tools:
+            index: Dict[str, List[dict]] = defaultdict(list)
+            for tool in self.skill_tools.values():
+                index[tool.get("skill")].append(tool)
+            self._tools_by_skill = (self.skill_tools, index)
+        return self._tools_by_skill[1].get(skill_name, [])
+    
     def get_enabled_tools(self) -> Dict[str, dict]:
         """Get all enabled tools from skills"""
         return {name: tool for name, tool in self.skill_tools.items() if tool.get("enabled", True)}
@@ -190,13 +370,15 @@ class SkillsManager:
                 prompts.append(f"# Skill: {skill.name}\n{skill.system_prompt}")
         return prompts
     
-    def get_skill_mentions(self) -> str:
+    def get_skill_mentions(self, skills: Optional[Dict[str, Skill]] = None) -> str:
         """Get skill mentions for system prompt (name + description only)
         
         Agent should use list_directory/read_file to load full instructions when needed.
         Skills are available at /data/skills/{name}/ or user workspace /workspace/{user_id}/skills/
         """
-        if not self.skills:
+        if skills is None:
+            skills = self.skills
+        if not skills:
             return ""
         
         lines = ["## Available Skills", ""]
@@ -208,7 +390,7 @@ class SkillsManager:
         lines.append("| Skill | Description |")
         lines.append("|-------|-------------|")
         
-        for skill in self.skills.values():
+        for skill in skills.values():
             if skill.enabled:
                 # Truncate description to ~80 chars
                 desc = skill.description[:80] + "..." if len(skill.description) > 80 else skill.description
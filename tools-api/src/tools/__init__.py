@@ -12,12 +12,17 @@ Tools API - Modular Tool Definitions
 - TOOLS: Dict[str, ToolDefinition] - определения tools
 """
 
-from typing import Dict, Any
+from typing import Dict, FrozenSet, List, Mapping
+from types import MappingProxyType
 import importlib
 from pathlib import Path
 
-# Registry
-ALL_TOOLS: Dict[str, dict] = {}
+# Registry, filled once by load_all_tools(); ALL_TOOLS is its read-only view
+_registry: Dict[str, dict] = {}
+ALL_TOOLS: Mapping[str, dict] = MappingProxyType(_registry)
+
+# Built-in tools in OpenAI function format, built once alongside the registry
+_openai_tools: Dict[str, dict] = {}
 
 # Tool categories for documentation
 CATEGORIES = {
@@ -29,11 +34,9 @@ CATEGORIES = {
 }
 
 
-def load_all_tools() -> Dict[str, dict]:
-    """Load all tool definitions from modules"""
-    global ALL_TOOLS
-    
-    if ALL_TOOLS:
+def load_all_tools() -> Mapping[str, dict]:
+    """Load all tool definitions from modules (read-only mapping)"""
+    if _registry:
         return ALL_TOOLS
     
     tools_dir = Path(__file__).parent
@@ -47,15 +50,55 @@ def load_all_tools() -> Dict[str, dict]:
             module = importlib.import_module(f".{module_name}", package="src.tools")
             
             if hasattr(module, "TOOLS"):
-                ALL_TOOLS.update(module.TOOLS)
+                _registry.update(module.TOOLS)
         except Exception as e:
             print(f"[tools-api] Failed to load {module_name}: {e}")
     
+    for name, tool in _registry.items():
+        for problem in schema_problems(tool):
+            print(f"[tools-api] Tool {name}: {problem}")
+        _openai_tools[name] = _build_openai_format(tool)
+    
     return ALL_TOOLS
 
 
-def get_all_tools() -> Dict[str, dict]:
-    """Get all tool definitions"""
+def schema_problems(tool: dict) -> List[str]:
+    """Mistakes in a tool's parameter schema that would make the LLM miscall it"""
+    params = tool["parameters"]
+    props = params.get("properties", {})
+    problems = []
+    missing = set(params.get("required", [])) - props.keys()
+    if missing:
+        problems.append(f"required but not declared: {sorted(missing)}")
+    for prop, spec in props.items():
+        enum = spec.get("enum")
+        if enum and len(set(enum)) != len(enum):
+            problems.append(f"duplicate enum values in {prop}")
+    return problems
+
+
+def _build_openai_format(tool: dict) -> dict:
+    return {
+        "type": "function",
+        "function": {
+            "name": tool["name"],
+            "description": tool["description"],
+            "parameters": tool["parameters"]
+        }
+    }
+
+
+def to_openai_format(tool: dict) -> dict:
+    """Tool definition in OpenAI function format (prebuilt for built-in tools)"""
+    if tool.get("source", "builtin").startswith("builtin"):
+        cached = _openai_tools.get(tool["name"])
+        if cached is not None:
+            return cached
+    return _build_openai_format(tool)
+
+
+def get_all_tools() -> Mapping[str, dict]:
+    """Get all tool definitions (read-only mapping)"""
     return load_all_tools()
 
 
@@ -83,11 +126,12 @@ def get_tools_by_category(category: str) -> Dict[str, dict]:
 
 
 # Bot-only tools (not managed by this API, always available for bot)
-BOT_ONLY_TOOLS = ["send_file", "send_dm", "manage_message", "ask_user"]
+BOT_ONLY_TOOLS_ORDERED = ("send_file", "send_dm", "manage_message", "ask_user")
+BOT_ONLY_TOOLS: FrozenSet[str] = frozenset(BOT_ONLY_TOOLS_ORDERED)
 
 # Userbot-only tools (require userbot to be running)
-USERBOT_TOOLS = [
+USERBOT_TOOLS: FrozenSet[str] = frozenset((
     "telegram_channel", "telegram_join", "telegram_send", 
     "telegram_history", "telegram_dialogs", "telegram_delete", 
     "telegram_edit", "telegram_resolve"
-]
+))
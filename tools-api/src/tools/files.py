@@ -73,7 +73,8 @@ TOOLS = {
         "parameters": {
             "type": "object",
             "properties": {
-                "pattern": {"type": "string", "description": "Glob pattern (e.g. **/*.py)"}
+                "pattern": {"type": "string", "description": "Glob pattern (e.g. **/*.py)"},
+                "limit": {"type": "integer", "description": "Max results (default 200)"}
             },
             "required": ["pattern"]
         }
@@ -82,14 +83,15 @@ TOOLS = {
     "search_text": {
         "enabled": True,
         "name": "search_text",
-        "description": "Search text in files using grep.",
+        "description": "Search text in files using ripgrep. pattern is a Rust/PCRE-style regex: ( ) | + ? { } are operators, so escape them or set literal=true to match them as text.",
         "source": "builtin",
         "parameters": {
             "type": "object",
             "properties": {
                 "pattern": {"type": "string", "description": "Text/regex to search"},
                 "path": {"type": "string", "description": "Directory to search"},
-                "ignore_case": {"type": "boolean", "description": "Case insensitive"}
+                "ignore_case": {"type": "boolean", "description": "Case insensitive"},
+                "literal": {"type": "boolean", "description": "Treat pattern as plain text, not regex (faster)"}
             },
             "required": ["pattern"]
         }
@@ -98,7 +100,7 @@ TOOLS = {
     "list_directory": {
         "enabled": True,
         "name": "list_directory",
-        "description": "List directory contents.",
+        "description": "List directory contents, one entry per line: mode, size in bytes, modification time, name (directories end with /). A file path lists just that file.",
         "source": "builtin",
         "parameters": {
             "type": "object",
@@ -3,37 +3,73 @@
 import asyncio
 import json
 import os
-import tempfile
+import time
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from fastapi.testclient import TestClient
 
-from src.mcp import MCPServer, fetch_mcp_tools
+from src.mcp import _INITIALIZE_BODY, MCPServer, call_mcp_tool, fetch_mcp_tools
 
 
 # ----- Helpers for fetch_mcp_tools tests -----
 
-def _make_response(status_code: int, headers: dict = None, text: str = "", json_body: dict = None):
+def _make_response(status_code: int, headers: dict = None, text: str = ""):
     resp = MagicMock()
     resp.status_code = status_code
     resp.headers = MagicMock()
     resp.headers.get.side_effect = lambda k, d=None: (headers or {}).get(k, d)
     resp.text = text
-    if json_body is not None:
-        resp.json = MagicMock(return_value=json_body)
-    else:
-        resp.json = MagicMock(side_effect=ValueError("not JSON"))
+
+    async def aiter_bytes():
+        # Small chunks so SSE lines span chunk boundaries
+        body = text.encode()
+        for i in range(0, len(body), 7):
+            yield body[i:i + 7]
+
+    resp.aiter_bytes = aiter_bytes
+    resp.aread = AsyncMock(return_value=text.encode())
     return resp
 
 
+def _mock_client(init_responses: list, rpc_responses: list):
+    """Client whose stream() answers initialize from init_responses and other requests from rpc_responses.
+
+    Requests are recorded on the .initialize and .rpc mocks.
+    """
+    mock_client = MagicMock()
+    mock_client.initialize = AsyncMock(side_effect=init_responses)
+    mock_client.rpc = AsyncMock(side_effect=rpc_responses)
+
+    def _stream(method, url, **kwargs):
+        is_init = kwargs.get("content") == _INITIALIZE_BODY
+
+        async def enter():
+            target = mock_client.initialize if is_init else mock_client.rpc
+            return await target(method, url, **kwargs)
+
+        ctx = MagicMock()
+        ctx.__aenter__ = AsyncMock(side_effect=enter)
+        ctx.__aexit__ = AsyncMock(return_value=None)
+        return ctx
+
+    mock_client.stream = MagicMock(side_effect=_stream)
+    return mock_client
+
+
 # ----- Fixtures for route tests -----
 
+@pytest.fixture(autouse=True)
+def fresh_sessions():
+    """Each test starts without cached MCP sessions."""
+    with patch("src.mcp._session_cache", {}), patch("src.mcp._session_locks", {}):
+        yield
+
+
 @pytest.fixture(scope="module")
-def temp_data_dir():
+def temp_data_dir(tmp_path_factory):
     """Temporary directory for MCP config and cache in tests."""
-    with tempfile.TemporaryDirectory() as d:
-        yield d
+    return str(tmp_path_factory.mktemp("mcp"))
 
 
 @pytest.fixture(scope="module")
@@ -111,45 +147,187 @@ def test_add_mcp_server_without_api_key(client):
     assert no_auth.get("api_key_set") is False
 
 
+def test_refresh_all_reports_every_enabled_server(client):
+    """POST /mcp/refresh-all returns a result entry per enabled server."""
+    client.post("/mcp/servers", json={"name": "refresh-a", "url": "http://localhost:6001"})
+    client.post("/mcp/servers", json={"name": "refresh-b", "url": "http://localhost:6002"})
+    r = client.post("/mcp/refresh-all")
+    assert r.status_code == 200
+    results = r.json()["results"]
+    assert "refresh-a" in results and "refresh-b" in results
+    assert results["refresh-a"]["success"] is False
+
+
+def test_refresh_all_times_out_slow_servers_only(client):
+    """A server that exceeds the refresh-all bound fails alone; the others still load."""
+    client.post("/mcp/servers", json={"name": "slow", "url": "http://localhost:6003"})
+    client.post("/mcp/servers", json={"name": "fast", "url": "http://localhost:6004"})
+
+    async def fake_fetch(server):
+        if server.name == "slow":
+            await asyncio.sleep(5)
+        return [{"name": "ping"}]
+
+    with patch("src.routes.mcp.fetch_mcp_tools", new=fake_fetch), patch("src.routes.mcp.REFRESH_ALL_TIMEOUT", 0.05):
+        results = client.post("/mcp/refresh-all").json()["results"]
+    assert results["slow"] == {"success": False, "error": "Timed out after 0.05s"}
+    assert results["fast"] == {"success": True, "tools": 1}
+
+
+def test_refresh_all_limits_concurrent_fetches(client):
+    """No more than REFRESH_ALL_CONCURRENCY fetches run at once."""
+    for i in range(5):
+        client.post("/mcp/servers", json={"name": f"limited-{i}", "url": f"http://localhost:{6100 + i}"})
+    running = peak = 0
+
+    async def fake_fetch(server):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return []
+
+    with patch("src.routes.mcp.fetch_mcp_tools", new=fake_fetch), patch("src.routes.mcp.REFRESH_ALL_CONCURRENCY", 2):
+        results = client.post("/mcp/refresh-all").json()["results"]
+    assert all(f"limited-{i}" in results for i in range(5))
+    assert peak == 2
+
+
+def test_toggle_writes_config_without_mutating_cached_servers(client):
+    """Toggling saves a new server object; objects handed out earlier keep their state."""
+    from src.mcp import load_mcp_config
+
+    client.post("/mcp/servers", json={"name": "toggled", "url": "http://localhost:6200"})
+    before = load_mcp_config()["toggled"]
+    assert client.put("/mcp/servers/toggled/toggle", json={"enabled": False}).status_code == 200
+    assert before.enabled is True
+    assert load_mcp_config()["toggled"].enabled is False
+
+
+def test_toggle_to_current_state_is_a_no_op(client):
+    """Re-sending the current enabled state neither rewrites the config nor fetches tools."""
+    client.post("/mcp/servers", json={"name": "steady", "url": "http://localhost:6201"})
+    fetch = AsyncMock(return_value=[])
+
+    with patch("src.routes.mcp.fetch_mcp_tools", new=fetch), patch("src.routes.mcp.save_mcp_config") as save:
+        r = client.put("/mcp/servers/steady/toggle", json={"enabled": True})
+    assert r.json() == {"success": True, "name": "steady", "enabled": True}
+    fetch.assert_not_called()
+    save.assert_not_called()
+
+
+def test_list_servers_revalidates_stale_servers_in_background(client):
+    """Listing answers from the cache and refreshes stale servers once, after the response."""
+    from src.routes import mcp as mcp_routes
+
+    client.post("/mcp/servers", json={"name": "swr", "url": "http://localhost:6005"})
+    fetch = AsyncMock(return_value=[{"name": "fresh"}])
+
+    async def run():
+        mcp_routes.mcp_cache.refreshed_at["swr"] = time.monotonic() - 3600
+        first = await mcp_routes.list_mcp_servers()
+        await mcp_routes.list_mcp_servers()  # revalidation already in flight
+        await asyncio.gather(*mcp_routes._revalidations.values())
+        second = await mcp_routes.list_mcp_servers()
+        return first, second
+
+    with patch("src.routes.mcp.fetch_mcp_tools", new=fetch), patch("src.routes.mcp._revalidations", {}):
+        first, second = asyncio.run(run())
+
+    by_name = lambda resp: {s["name"]: s for s in resp["servers"]}
+    assert by_name(first)["swr"]["tool_count"] == 0
+    assert by_name(second)["swr"]["tool_count"] == 1
+    assert [c.args[0].name for c in fetch.call_args_list].count("swr") == 1
+
+
+def test_revalidation_skips_server_disabled_mid_fetch(client):
+    """A server disabled while its revalidation is in flight keeps its cleared tools and status."""
+    from src.routes import mcp as mcp_routes
+
+    client.post("/mcp/servers", json={"name": "swr-off", "url": "http://localhost:6006"})
+    server = mcp_routes.load_mcp_config()["swr-off"]
+
+    async def fetch(_):
+        client.put("/mcp/servers/swr-off/toggle", json={"enabled": False})
+        return [{"name": "late"}]
+
+    with patch("src.routes.mcp.fetch_mcp_tools", new=fetch):
+        asyncio.run(mcp_routes._revalidate("swr-off", server))
+
+    assert mcp_routes.mcp_cache.tool_count("swr-off") == 0
+    assert mcp_routes.mcp_cache.server_status["swr-off"]["connected"] is False
+
+
+def test_load_cache_seeds_refreshed_at_from_last_refresh(tmp_path):
+    """Servers refreshed shortly before a restart are not treated as stale after it."""
+    from datetime import datetime, timedelta
+    from src.mcp import MCPToolsCache
+
+    cache_file = tmp_path / "mcp_tools_cache.json"
+    cache_file.write_text(json.dumps({"tools": {}, "server_status": {
+        "recent": {"connected": True, "last_refresh": (datetime.now() - timedelta(seconds=10)).isoformat()},
+        "never": {"connected": True},
+    }}))
+    with patch("src.mcp.MCP_TOOLS_CACHE", str(cache_file)):
+        cache = MCPToolsCache()
+        cache.load_cache()
+
+    assert 9 <= time.monotonic() - cache.refreshed_at["recent"] < 60
+    assert "never" not in cache.refreshed_at
+
+
 # ----- fetch_mcp_tools tests (Streamable HTTP, legacy, SSE) -----
 
+def test_unknown_server_returns_404_detail(client):
+    """Missing servers answer 404 with the usual {"detail": ...} body."""
+    r = client.delete("/mcp/servers/no-such-server")
+    assert r.status_code == 404
+    assert r.json() == {"detail": "Server no-such-server not found"}
+
+
 def test_streamable_http_sse_tools_list():
     """Streamable HTTP: session id in header, tools/list returns SSE lines."""
     init_resp = _make_response(200, {"mcp-session-id": "sess-123"}, "")
     tools_body = 'data: {"result":{"tools":[{"name":"tool_a"},{"name":"tool_b"}]}}\n'
     tools_resp = _make_response(200, {}, tools_body)
+    mock_client = _mock_client([init_resp], [tools_resp])
 
-    mock_post = AsyncMock(side_effect=[init_resp, tools_resp])
-    mock_client = MagicMock()
-    mock_client.post = mock_post
-    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_client.__aexit__ = AsyncMock(return_value=None)
-
-    with patch("src.mcp.httpx.AsyncClient", return_value=mock_client):
+    with patch("src.mcp.get_client", new=AsyncMock(return_value=mock_client)):
         server = MCPServer(name="stream", url="http://localhost:8000", transport="http")
         result = asyncio.run(fetch_mcp_tools(server))
 
     assert result == [{"name": "tool_a"}, {"name": "tool_b"}]
-    assert mock_post.call_count == 2
+    assert mock_client.initialize.call_count == 1
+    assert mock_client.rpc.call_count == 1
+    assert mock_client.rpc.call_args.kwargs["headers"]["mcp-session-id"] == "sess-123"
 
 
 def test_streamable_http_session_id_from_body():
     """Streamable HTTP: session id in initialize response body when not in header."""
-    init_resp = _make_response(200, {}, "", json_body={"result": {"sessionId": "from-body"}})
+    init_resp = _make_response(200, {}, '{"result": {"sessionId": "from-body"}}')
     tools_resp = _make_response(200, {}, 'data: {"result":{"tools":[{"name":"only"}]}}\n')
+    mock_client = _mock_client([init_resp], [tools_resp])
 
-    mock_post = AsyncMock(side_effect=[init_resp, tools_resp])
-    mock_client = MagicMock()
-    mock_client.post = mock_post
-    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_client.__aexit__ = AsyncMock(return_value=None)
-
-    with patch("src.mcp.httpx.AsyncClient", return_value=mock_client):
+    with patch("src.mcp.get_client", new=AsyncMock(return_value=mock_client)):
         server = MCPServer(name="stream", url="http://localhost:8000", transport="http")
         result = asyncio.run(fetch_mcp_tools(server))
 
     assert result == [{"name": "only"}]
-    assert mock_post.call_count == 2
+    assert mock_client.rpc.call_args.kwargs["headers"]["mcp-session-id"] == "from-body"
+
+
+def test_streamable_http_session_id_from_sse_initialize():
+    """Session id in an SSE initialize reply is taken from its first event."""
+    init_resp = _make_response(200, {}, 'event: message\ndata: {"result": {"sessionId": "sse-sess"}}\n\n')
+    tools_resp = _make_response(200, {}, '{"result": {"tools": []}}')
+    mock_client = _mock_client([init_resp], [tools_resp])
+
+    with patch("src.mcp.get_client", new=AsyncMock(return_value=mock_client)):
+        server = MCPServer(name="stream", url="http://localhost:8000", transport="http")
+        assert asyncio.run(fetch_mcp_tools(server)) == []
+
+    assert mock_client.rpc.call_args.kwargs["headers"]["mcp-session-id"] == "sse-sess"
 
 
 def test_streamable_http_tools_list_single_json():
@@ -158,35 +336,42 @@ def test_streamable_http_tools_list_single_json():
     tools_resp = _make_response(
         200,
         {},
-        json.dumps({"result": {"tools": [{"name": "json_tool"}]}}),
+        json.dumps({"result": {"tools": [{"name": "json_tool"}]}}, indent=2),
     )
+    mock_client = _mock_client([init_resp], [tools_resp])
 
-    mock_post = AsyncMock(side_effect=[init_resp, tools_resp])
-    mock_client = MagicMock()
-    mock_client.post = mock_post
-    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_client.__aexit__ = AsyncMock(return_value=None)
-
-    with patch("src.mcp.httpx.AsyncClient", return_value=mock_client):
+    with patch("src.mcp.get_client", new=AsyncMock(return_value=mock_client)):
         server = MCPServer(name="stream", url="http://localhost:8000", transport="http")
         result = asyncio.run(fetch_mcp_tools(server))
 
     assert result == [{"name": "json_tool"}]
 
 
+def test_streamable_http_tools_list_declared_json():
+    """Streamable HTTP: an application/json tools/list body is decoded without SSE scanning."""
+    init_resp = _make_response(200, {"mcp-session-id": "sess-1"}, "")
+    tools_resp = _make_response(
+        200,
+        {"content-type": "application/json"},
+        json.dumps({"result": {"tools": [{"name": "json_tool", "description": "data:\n\nnot an event"}]}}),
+    )
+    mock_client = _mock_client([init_resp], [tools_resp])
+
+    with patch("src.mcp.get_client", new=AsyncMock(return_value=mock_client)):
+        server = MCPServer(name="stream", url="http://localhost:8000", transport="http")
+        result = asyncio.run(fetch_mcp_tools(server))
+
+    assert result == [{"name": "json_tool", "description": "data:\n\nnot an event"}]
+
+
 def test_streamable_http_empty_data_line_skipped():
     """Streamable HTTP: empty 'data:' line is skipped without crash."""
     init_resp = _make_response(200, {"mcp-session-id": "sess-1"}, "")
     tools_body = 'data: \ndata: {"result":{"tools":[{"name":"one"}]}}\n'
     tools_resp = _make_response(200, {}, tools_body)
+    mock_client = _mock_client([init_resp], [tools_resp])
 
-    mock_post = AsyncMock(side_effect=[init_resp, tools_resp])
-    mock_client = MagicMock()
-    mock_client.post = mock_post
-    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_client.__aexit__ = AsyncMock(return_value=None)
-
-    with patch("src.mcp.httpx.AsyncClient", return_value=mock_client):
+    with patch("src.mcp.get_client", new=AsyncMock(return_value=mock_client)):
         server = MCPServer(name="stream", url="http://localhost:8000", transport="http")
         result = asyncio.run(fetch_mcp_tools(server))
 
@@ -195,57 +380,81 @@ def test_streamable_http_empty_data_line_skipped():
 
 def test_legacy_json_rpc_tools_list():
     """Legacy path: no session id, tools/list returns plain JSON-RPC."""
-    init_resp = _make_response(200, {}, "", json_body={})
+    init_resp = _make_response(200, {}, "{}")
     tools_resp = _make_response(
         200,
         {},
         json.dumps({"result": {"tools": [{"name": "legacy_a"}]}}),
     )
+    mock_client = _mock_client([init_resp], [tools_resp])
 
-    mock_post = AsyncMock(side_effect=[init_resp, tools_resp])
-    mock_client = MagicMock()
-    mock_client.post = mock_post
-    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_client.__aexit__ = AsyncMock(return_value=None)
-
-    with patch("src.mcp.httpx.AsyncClient", return_value=mock_client):
+    with patch("src.mcp.get_client", new=AsyncMock(return_value=mock_client)):
         server = MCPServer(name="legacy", url="http://localhost:8000", transport="http")
         result = asyncio.run(fetch_mcp_tools(server))
 
     assert result == [{"name": "legacy_a"}]
+    assert "mcp-session-id" not in mock_client.rpc.call_args.kwargs["headers"]
 
 
 def test_legacy_sse_fallback():
     """Legacy path: tools/list returns SSE when body is not single JSON."""
-    init_resp = _make_response(200, {}, "", json_body={})
+    init_resp = _make_response(200, {}, "{}")
     tools_body = 'data: {"result":{"tools":[{"name":"sse_legacy"}]}}\n'
     tools_resp = _make_response(200, {}, tools_body)
+    mock_client = _mock_client([init_resp], [tools_resp])
 
-    mock_post = AsyncMock(side_effect=[init_resp, tools_resp])
-    mock_client = MagicMock()
-    mock_client.post = mock_post
-    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_client.__aexit__ = AsyncMock(return_value=None)
-
-    with patch("src.mcp.httpx.AsyncClient", return_value=mock_client):
+    with patch("src.mcp.get_client", new=AsyncMock(return_value=mock_client)):
         server = MCPServer(name="legacy", url="http://localhost:8000", transport="http")
         result = asyncio.run(fetch_mcp_tools(server))
 
     assert result == [{"name": "sse_legacy"}]
 
 
+def test_sse_stops_at_first_tools_event():
+    """SSE: reading stops at the first event that carries result.tools."""
+    init_resp = _make_response(200, {"mcp-session-id": "s"}, "")
+    tools_body = (
+        'event: message\n'
+        'data: {"result":{"tools":[{"name":"first"}]}}\n'
+        '\n'
+        'data: {"result":{"tools":[{"name":"second"}]}}\n'
+    )
+    tools_resp = _make_response(200, {}, tools_body)
+    mock_client = _mock_client([init_resp], [tools_resp])
+
+    with patch("src.mcp.get_client", new=AsyncMock(return_value=mock_client)):
+        server = MCPServer(name="stream", url="http://localhost:8000", transport="http")
+        result = asyncio.run(fetch_mcp_tools(server))
+
+    assert result == [{"name": "first"}]
+
+
+def test_sse_multiline_event_with_crlf_and_comments():
+    """SSE: data lines of one event are joined; CRLF endings and ':' comments are handled."""
+    init_resp = _make_response(200, {"mcp-session-id": "s"}, "")
+    tools_body = (
+        ': keepalive\r\n'
+        'event: message\r\n'
+        'data: {"result":\r\n'
+        'data: {"tools":[{"name":"split"}]}}\r\n'
+        '\r\n'
+    )
+    mock_client = _mock_client([init_resp], [_make_response(200, {}, tools_body)])
+
+    with patch("src.mcp.get_client", new=AsyncMock(return_value=mock_client)):
+        server = MCPServer(name="stream", url="http://localhost:8000", transport="http")
+        result = asyncio.run(fetch_mcp_tools(server))
+
+    assert result == [{"name": "split"}]
+
+
 def test_bearer_auth_sent_when_api_key_set():
     """Authorization Bearer header is sent when server has api_key."""
     init_resp = _make_response(200, {"mcp-session-id": "s"}, "")
     tools_resp = _make_response(200, {}, 'data: {"result":{"tools":[]}}\n')
+    mock_client = _mock_client([init_resp], [tools_resp])
 
-    mock_post = AsyncMock(side_effect=[init_resp, tools_resp])
-    mock_client = MagicMock()
-    mock_client.post = mock_post
-    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_client.__aexit__ = AsyncMock(return_value=None)
-
-    with patch("src.mcp.httpx.AsyncClient", return_value=mock_client):
+    with patch("src.mcp.get_client", new=AsyncMock(return_value=mock_client)):
         server = MCPServer(
             name="auth",
             url="http://localhost:8000",
@@ -254,25 +463,272 @@ def test_bearer_auth_sent_when_api_key_set():
         )
         asyncio.run(fetch_mcp_tools(server))
 
-    calls = mock_post.call_args_list
+    calls = mock_client.initialize.call_args_list
     assert len(calls) >= 1
     first_kw = calls[0].kwargs
     assert first_kw["headers"].get("Authorization") == "Bearer secret-token"
+    assert mock_client.rpc.call_args.kwargs["headers"].get("Authorization") == "Bearer secret-token"
 
 
 def test_initialize_non_200_returns_empty():
     """When initialize returns non-200, no session path; legacy tools/list also fails, result empty."""
     init_resp = _make_response(403, {}, "Forbidden")
+    tools_resp = _make_response(403, {}, "Forbidden")
+    mock_client = _mock_client([init_resp], [tools_resp])
 
-    mock_post = AsyncMock(return_value=init_resp)
-    mock_client = MagicMock()
-    mock_client.post = mock_post
-    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_client.__aexit__ = AsyncMock(return_value=None)
-
-    with patch("src.mcp.httpx.AsyncClient", return_value=mock_client):
+    with patch("src.mcp.get_client", new=AsyncMock(return_value=mock_client)):
         server = MCPServer(name="bad", url="http://localhost:8000", transport="http")
         result = asyncio.run(fetch_mcp_tools(server))
 
     assert result == []
-    assert mock_post.call_count == 2
+    assert mock_client.initialize.call_count == 1
+    assert mock_client.rpc.call_count == 1
+
+
+# ----- call_mcp_tool session reuse -----
+
+def test_call_mcp_tool_reuses_session():
+    """Second tool call reuses the cached session id and skips initialize."""
+    init_resp = _make_response(200, {"mcp-session-id": "sess-9"}, "")
+    call_body = 'data: {"result":{"content":[]}}\n'
+    mock_client = _mock_client(
+        [init_resp],
+        [_make_response(200, {}, call_body), _make_response(200, {}, call_body)],
+    )
+
+    async def run():
+        server = MCPServer(name="srv", url="http://localhost:8000", transport="http")
+        first = await call_mcp_tool(server, "t", {})
+        second = await call_mcp_tool(server, "t", {})
+        return first, second
+
+    with patch("src.mcp.get_client", new=AsyncMock(return_value=mock_client)):
+        first, second = asyncio.run(run())
+
+    assert first == second == {"success": True, "result": {"content": []}}
+    assert mock_client.initialize.call_count == 1
+    assert mock_client.rpc.call_count == 2
+    assert mock_client.rpc.call_args.kwargs["headers"]["mcp-session-id"] == "sess-9"
+
+
+def test_concurrent_calls_share_one_initialize():
+    """Parallel first calls to a server wait for a single initialize."""
+    call_body = '{"result": "ok"}'
+    mock_client = _mock_client([], [_make_response(200, {}, call_body) for _ in range(3)])
+
+    async def slow_initialize(*args, **kwargs):
+        await asyncio.sleep(0.01)
+        return _make_response(200, {"mcp-session-id": "shared"}, "")
+
+    mock_client.initialize = AsyncMock(side_effect=slow_initialize)
+
+    async def run():
+        server = MCPServer(name="srv", url="http://localhost:8000", transport="http")
+        return await asyncio.gather(*(call_mcp_tool(server, "t", {}) for _ in range(3)))
+
+    with patch("src.mcp.get_client", new=AsyncMock(return_value=mock_client)):
+        results = asyncio.run(run())
+
+    assert all(r == {"success": True, "result": "ok"} for r in results)
+    assert mock_client.initialize.call_count == 1
+
+
+def test_concurrent_fetches_share_one_tools_list():
+    """Parallel fetches for one server collapse into a single tools/list request."""
+    mock_client = _mock_client([_make_response(200, {"mcp-session-id": "s"}, "")], [])
+
+    async def slow_tools_list(*args, **kwargs):
+        await asyncio.sleep(0.01)
+        return _make_response(200, {}, '{"result": {"tools": [{"name": "t"}]}}')
+
+    mock_client.rpc = AsyncMock(side_effect=slow_tools_list)
+
+    async def run():
+        server = MCPServer(name="srv", url="http://localhost:8000", transport="http")
+        return await asyncio.gather(*(fetch_mcp_tools(server) for _ in range(3)))
+
+    with patch("src.mcp.get_client", new=AsyncMock(return_value=mock_client)):
+        results = asyncio.run(run())
+
+    assert results == [[{"name": "t"}]] * 3
+    assert mock_client.rpc.call_count == 1
+
+
+def test_fetch_reuses_session_from_tool_call():
+    """tools/list after a tool call reuses the cached session instead of re-initializing."""
+    mock_client = _mock_client(
+        [_make_response(200, {"mcp-session-id": "shared"}, "")],
+        [_make_response(200, {}, '{"result": 1}'), _make_response(200, {}, '{"result": {"tools": []}}')],
+    )
+
+    async def run():
+        server = MCPServer(name="srv", url="http://localhost:8000", transport="http")
+        await call_mcp_tool(server, "t", {})
+        return await fetch_mcp_tools(server)
+
+    with patch("src.mcp.get_client", new=AsyncMock(return_value=mock_client)):
+        assert asyncio.run(run()) == []
+
+    assert mock_client.initialize.call_count == 1
+    assert mock_client.rpc.call_args.kwargs["headers"]["mcp-session-id"] == "shared"
+
+
+def test_call_mcp_tool_reinitializes_expired_session():
+    """A 404 on a cached session evicts it and retries once with a fresh initialize."""
+    mock_client = _mock_client(
+        [_make_response(200, {"mcp-session-id": "new"}, "")],
+        [_make_response(404, {}, "unknown session"), _make_response(200, {}, '{"result": 42}')],
+    )
+    cache = {("http://localhost:8000", None): ("old", float("inf"))}
+
+    with patch("src.mcp.get_client", new=AsyncMock(return_value=mock_client)), \
+            patch("src.mcp._session_cache", cache):
+        server = MCPServer(name="srv", url="http://localhost:8000", transport="http")
+        result = asyncio.run(call_mcp_tool(server, "t", {}))
+
+    assert result == {"success": True, "result": 42}
+    assert mock_client.initialize.call_count == 1
+    assert mock_client.rpc.call_args.kwargs["headers"]["mcp-session-id"] == "new"
+    assert cache[("http://localhost:8000", None)][0] == "new"
+
+
+def test_sessions_are_kept_per_api_key():
+    """Two servers on one endpoint with different tokens don't share a session."""
+    mock_client = _mock_client(
+        [_make_response(200, {"mcp-session-id": "for-a"}, ""), _make_response(200, {"mcp-session-id": "for-b"}, "")],
+        [_make_response(200, {}, '{"result": 1}'), _make_response(200, {}, '{"result": 2}')],
+    )
+
+    async def run():
+        a = MCPServer(name="a", url="http://localhost:8000", transport="http", api_key="key-a")
+        b = MCPServer(name="b", url="http://localhost:8000", transport="http", api_key="key-b")
+        await call_mcp_tool(a, "t", {})
+        await call_mcp_tool(b, "t", {})
+
+    with patch("src.mcp.get_client", new=AsyncMock(return_value=mock_client)):
+        asyncio.run(run())
+
+    assert mock_client.initialize.call_count == 2
+    sent = [(c.kwargs["headers"]["Authorization"], c.kwargs["headers"]["mcp-session-id"]) for c in mock_client.rpc.call_args_list]
+    assert sent == [("Bearer key-a", "for-a"), ("Bearer key-b", "for-b")]
+
+
+# ----- keep_warm -----
+
+def test_keep_warm_skips_failed_and_legacy_servers():
+    """A failed initialize marks the server disconnected and stops further attempts; legacy servers aren't pinged."""
+    from src.mcp import MCPToolsCache, keep_warm
+
+    mock_client = _mock_client(
+        [_make_response(503, {}, "down"), _make_response(200, {}, "")],
+        [],
+    )
+    servers = {
+        "down": MCPServer(name="down", url="http://down:8000", transport="http"),
+        "legacy": MCPServer(name="legacy", url="http://legacy:8000", transport="http"),
+    }
+    sleeps = 0
+
+    async def sleep(_):
+        nonlocal sleeps
+        sleeps += 1
+        if sleeps == 3:
+            raise asyncio.CancelledError
+
+    cache = MCPToolsCache.__new__(MCPToolsCache)
+    cache.server_status = {"down": {"connected": True, "tool_count": 4}}
+    cache.schedule_save = MagicMock()
+    with patch("src.mcp.get_client", new=AsyncMock(return_value=mock_client)), \
+            patch("src.mcp.load_mcp_config", return_value=servers), \
+            patch("src.mcp.mcp_cache", cache), patch("src.mcp.asyncio.sleep", sleep):
+        with pytest.raises(asyncio.CancelledError):
+            asyncio.run(keep_warm())
+
+    assert mock_client.initialize.call_count == 2
+    assert mock_client.rpc.call_count == 0
+    assert cache.server_status["down"] == {"connected": False, "tool_count": 4, "error": "Keep-alive failed"}
+    assert "legacy" not in cache.server_status
+
+
+# ----- load_mcp_config caching -----
+
+def test_load_mcp_config_reloads_on_external_change(tmp_path):
+    """Cached config is reused until the file's mtime changes."""
+    import src.mcp as mcp_module
+
+    config_file = tmp_path / "mcp_servers.json"
+    with patch("src.mcp.MCP_CONFIG_FILE", str(config_file)), patch("src.mcp._config_cache", None):
+        assert mcp_module.load_mcp_config() == {}
+
+        mcp_module.save_mcp_config({"a": MCPServer(name="a", url="http://a")})
+        assert list(mcp_module.load_mcp_config()) == ["a"]
+
+        config_file.write_text(json.dumps({"b": {"name": "b", "url": "http://b"}}))
+        st = os.stat(config_file)
+        os.utime(config_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        assert list(mcp_module.load_mcp_config()) == ["b"]
+
+
+# ----- MCPToolsCache persistence -----
+
+def test_tools_cache_writes_only_on_save(tmp_path):
+    """add_tools/clear_server_tools only mutate memory; save_cache skips clean state."""
+    from src.mcp import MCPToolsCache
+
+    cache_file = tmp_path / "mcp_tools_cache.json"
+    with patch("src.mcp.MCP_TOOLS_CACHE", str(cache_file)):
+        cache = MCPToolsCache()
+        cache.add_tools("srv", [{"name": "a"}, {"name": "b"}])
+        assert not cache_file.exists()
+
+        cache.save_cache()
+        assert set(json.loads(cache_file.read_text())["tools"]) == {"mcp_srv_a", "mcp_srv_b"}
+        assert not (tmp_path / "mcp_tools_cache.json.tmp").exists()
+
+        cache_file.unlink()
+        cache.save_cache()
+        assert not cache_file.exists()
+
+        cache.clear_server_tools("srv")
+        cache.save_cache()
+        assert json.loads(cache_file.read_text())["tools"] == {}
+
+
+def test_clear_server_tools_uses_index(tmp_path):
+    """Clearing one server leaves the others, also after reloading the cache file."""
+    from src.mcp import MCPToolsCache
+
+    with patch("src.mcp.MCP_TOOLS_CACHE", str(tmp_path / "mcp_tools_cache.json")):
+        cache = MCPToolsCache()
+        cache.add_tools("a", [{"name": "x"}, {"name": "y"}])
+        cache.add_tools("b", [{"name": "x"}])
+        assert (cache.tool_count("a"), cache.tool_count("b")) == (2, 1)
+        cache.save_cache()
+
+        reloaded = MCPToolsCache()
+        reloaded.load_cache()
+        reloaded.clear_server_tools("a")
+        assert set(reloaded.tools) == {"mcp_b_x"}
+        assert reloaded.tool_count("a") == 0
+
+
+def test_schedule_save_coalesces_writes(tmp_path):
+    """Several schedule_save() calls in a burst produce a single delayed write."""
+    from src.mcp import MCPToolsCache
+
+    cache_file = tmp_path / "mcp_tools_cache.json"
+
+    async def run(cache):
+        cache.add_tools("a", [{"name": "x"}])
+        cache.schedule_save()
+        cache.add_tools("b", [{"name": "y"}])
+        cache.schedule_save()
+        assert not cache_file.exists()
+        await cache._flush_task
+
+    with patch("src.mcp.MCP_TOOLS_CACHE", str(cache_file)), patch("src.mcp.SAVE_DEBOUNCE", 0.01):
+        cache = MCPToolsCache()
+        with patch.object(cache, "save_cache", wraps=cache.save_cache) as save:
+            asyncio.run(run(cache))
+        assert save.call_count == 1
+    assert set(json.loads(cache_file.read_text())["tools"]) == {"mcp_a_x", "mcp_b_y"}
@@ -0,0 +1,208 @@
+"""Skills tests: directory scanning, scan caching and install extraction."""
+
+import io
+import json
+import os
+import tarfile
+from unittest.mock import patch
+
+import pytest
+
+from src.routes.skills import _extract_skill
+from src.skills import SkillsManager, load_skill_prompt, read_frontmatter_description
+
+
+def _write_skill(root, name: str, **fields):
+    skill_dir = root / name
+    skill_dir.mkdir(parents=True, exist_ok=True)
+    (skill_dir / "skill.json").write_text(json.dumps({"name": name, "description": f"{name} skill", **fields}))
+    return skill_dir
+
+
+@pytest.fixture
+def skills_env(tmp_path):
+    """SkillsManager with shared skills dir and cache file in a temp dir."""
+    shared = tmp_path / "skills"
+    shared.mkdir()
+    with patch("src.skills.SHARED_SKILLS_DIR", str(shared)), patch(
+        "src.skills.SKILLS_CACHE", str(tmp_path / "skills_cache.json")
+    ), patch("src.skills.WORKSPACE_ROOT", str(tmp_path / "workspace")):
+        yield SkillsManager(), shared
+
+
+def test_scan_all_skips_unchanged_directories(skills_env):
+    """A second scan with nothing changed on disk does not re-read skill.json."""
+    manager, shared = skills_env
+    _write_skill(shared, "alpha", tools=[{"name": "run"}])
+
+    manager.scan_all()
+    assert "shared:alpha" in manager.skills
+    assert "skill_alpha_run" in manager.skill_tools
+
+    with patch.object(manager, "scan_directory", side_effect=AssertionError("rescanned")):
+        manager.scan_all()
+    assert "shared:alpha" in manager.skills
+
+
+def test_scan_all_picks_up_changes(skills_env):
+    """Adding a skill or editing skill.json invalidates the cached scan."""
+    manager, shared = skills_env
+    alpha = _write_skill(shared, "alpha")
+    manager.scan_all()
+
+    _write_skill(shared, "beta")
+    manager.scan_all()
+    assert {"shared:alpha", "shared:beta"} <= set(manager.skills)
+
+    (alpha / "skill.json").write_text(json.dumps({"name": "alpha", "description": "changed"}))
+    st = os.stat(alpha / "skill.json")
+    os.utime(alpha / "skill.json", ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    manager.scan_all()
+    assert manager.skills["shared:alpha"].description == "changed"
+
+
+def test_scan_all_picks_up_prompt_file_edits(skills_env):
+    """Editing only SKILL.md invalidates the cached scan."""
+    manager, shared = skills_env
+    alpha = _write_skill(shared, "alpha", system_prompt_file="SKILL.md")
+    (alpha / "SKILL.md").write_text("v1")
+    manager.scan_all()
+    assert manager.skills["shared:alpha"].system_prompt == "v1"
+
+    (alpha / "SKILL.md").write_text("v2")
+    st = os.stat(alpha / "SKILL.md")
+    os.utime(alpha / "SKILL.md", ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    manager.scan_all()
+    assert manager.skills["shared:alpha"].system_prompt == "v2"
+
+
+def test_set_enabled_survives_rescan(skills_env):
+    """Disabling a skill writes skill.json, so later scans keep it disabled."""
+    manager, shared = skills_env
+    alpha = _write_skill(shared, "alpha", tools=[{"name": "run"}])
+    manager.scan_all()
+
+    manager.set_enabled(manager.skills["shared:alpha"], False)
+    assert json.loads((alpha / "skill.json").read_text())["enabled"] is False
+
+    manager.scan_all()
+    assert manager.skills["shared:alpha"].enabled is False
+    assert "skill_alpha_run" not in manager.skill_tools
+
+
+def test_scan_caches_are_bounded(skills_env):
+    """Per-user scan results are evicted oldest first."""
+    manager, _ = skills_env
+    with patch("src.skills.MAX_CACHED_SCANS", 2):
+        for user_id in ("u1", "u2", "u3"):
+            manager.scan_all(user_id)
+            manager.scan_metadata_lightweight(user_id)
+    assert list(manager._scan_cache) == ["u2", "u3"]
+    assert list(manager._metadata_cache) == ["u2", "u3"]
+
+
+def test_metadata_scan_does_not_read_prompt_files(skills_env):
+    """The lightweight listing reads skill.json only; scan_all still loads SKILL.md."""
+    manager, shared = skills_env
+    alpha = _write_skill(shared, "alpha", system_prompt_file="SKILL.md", tools=[{"name": "run"}])
+    (alpha / "SKILL.md").write_text("# Alpha instructions")
+
+    skills = manager.scan_metadata_lightweight()
+    assert skills["shared:alpha"].description == "alpha skill"
+    assert skills["shared:alpha"].system_prompt is None
+    assert manager.skills == {}
+
+    manager.scan_all()
+    assert manager.skills["shared:alpha"].system_prompt == "# Alpha instructions"
+
+    # A full scan doesn't leak prompts (or self.skills itself) into the listing
+    skills = manager.scan_metadata_lightweight()
+    assert skills["shared:alpha"].system_prompt is None
+    assert skills is not manager.skills
+
+
+def test_extract_skill_takes_only_the_requested_directory(tmp_path):
+    """Only skills/{name}/ is unpacked from the repository tarball."""
+    archive = tmp_path / "skills.tar.gz"
+    with tarfile.open(archive, "w:gz") as tar:
+        for path, body in {
+            "skills-main/README.md": b"readme",
+            "skills-main/skills/pdf/SKILL.md": b"# PDF",
+            "skills-main/skills/pdf/scripts/fill.py": b"print()",
+            "skills-main/skills/pdfx/SKILL.md": b"# other",
+        }.items():
+            info = tarfile.TarInfo(path)
+            info.size = len(body)
+            tar.addfile(info, io.BytesIO(body))
+
+    dest = tmp_path / "pdf"
+    assert _extract_skill(str(archive), "pdf", str(dest))
+    assert (dest / "SKILL.md").read_bytes() == b"# PDF"
+    assert (dest / "scripts" / "fill.py").exists()
+    assert sorted(os.listdir(dest)) == ["SKILL.md", "scripts"]
+    assert not _extract_skill(str(archive), "docx", str(tmp_path / "docx"))
+
+
+def test_read_frontmatter_description(tmp_path):
+    """description comes from the SKILL.md frontmatter; missing/empty files give None."""
+    skill_md = tmp_path / "SKILL.md"
+    skill_md.write_text('---\nname: pdf\ndescription: "Fill and merge PDF forms"\n---\n\n# PDF\n')
+    assert read_frontmatter_description(str(skill_md)) == "Fill and merge PDF forms"
+
+    skill_md.write_text("---\nname: x\ndescription: Extends Claude's capabilities\n---\n")
+    assert read_frontmatter_description(str(skill_md)) == "Extends Claude's capabilities"
+
+    skill_md.write_text("---\nname: x\ndescription: 'Single quoted'\n---\n")
+    assert read_frontmatter_description(str(skill_md)) == "Single quoted"
+
+    skill_md.write_text("---\nname: x\n---\n\ndescription: from the body\n")
+    assert read_frontmatter_description(str(skill_md)) is None
+
+    skill_md.write_text("---\nname: x\ndescription:\nlicense: MIT\n---\n")
+    assert read_frontmatter_description(str(skill_md)) is None
+
+    (tmp_path / "empty.md").write_text("")
+    assert read_frontmatter_description(str(tmp_path / "empty.md")) is None
+    assert read_frontmatter_description(str(tmp_path / "missing.md")) is None
+
+
+def test_installed_names_follow_scans(skills_env):
+    """installed_names() is reused while nothing changes and rebuilt after a change."""
+    manager, shared = skills_env
+    _write_skill(shared, "pdf")
+    names = manager.installed_names()
+    assert names == {"pdf"}
+    assert manager.installed_names() is names
+
+    _write_skill(shared, "docx")
+    assert manager.installed_names() == {"pdf", "docx"}
+
+
+def test_get_skill_tools_uses_current_scan(skills_env):
+    """The per-skill tool index follows the latest scan."""
+    manager, shared = skills_env
+    _write_skill(shared, "alpha", tools=[{"name": "run"}, {"name": "stop"}])
+    _write_skill(shared, "beta", tools=[{"name": "go"}])
+    manager.scan_all()
+    assert [t["name"] for t in manager.get_skill_tools("alpha")] == ["skill_alpha_run", "skill_alpha_stop"]
+    assert manager.get_skill_tools("gamma") == []
+
+    _write_skill(shared, "gamma", tools=[{"name": "x"}])
+    manager.scan_all()
+    assert [t["name"] for t in manager.get_skill_tools("gamma")] == ["skill_gamma_x"]
+
+
+def test_skill_prompt_reads_are_cached_by_mtime(tmp_path):
+    """An unchanged prompt file is served from cache; a modified one is re-read."""
+    prompt = tmp_path / "SKILL.md"
+    prompt.write_text("v1")
+    assert load_skill_prompt(str(prompt)) == "v1"
+
+    with patch("builtins.open", side_effect=AssertionError("re-read")):
+        assert load_skill_prompt(str(prompt)) == "v1"
+
+    prompt.write_text("v2")
+    st = os.stat(prompt)
+    os.utime(prompt, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert load_skill_prompt(str(prompt)) == "v2"
+    assert load_skill_prompt(str(tmp_path / "missing.md")) is None
@@ -0,0 +1,85 @@
+"""Built-in tool definition tests."""
+
+import asyncio
+import importlib
+from pathlib import Path
+
+import pytest
+from unittest.mock import patch
+
+import src.tools
+from src.tools import get_all_tools, schema_problems, to_openai_format
+
+TOOL_MODULES = sorted(p.stem for p in Path(src.tools.__file__).parent.glob("*.py") if not p.name.startswith("_"))
+
+
+def test_every_module_contributes_unique_tools():
+    """Each tool is defined in exactly one module and all of them are registered."""
+    names = []
+    for module_name in TOOL_MODULES:
+        names.extend(importlib.import_module(f"src.tools.{module_name}").TOOLS)
+    assert len(names) == len(set(names))
+    assert set(get_all_tools()) == set(names)
+    assert len(names) == 25
+
+
+def test_registry_is_read_only():
+    """The shared registry can't be modified through get_all_tools()."""
+    tools = get_all_tools()
+    with pytest.raises(TypeError):
+        tools["injected"] = {}
+    assert "injected" not in get_all_tools()
+
+
+def test_openai_format_is_prebuilt_for_builtins():
+    """Built-in tools reuse one prebuilt entry; other tools are built per call."""
+    tool = dict(get_all_tools()["read_file"], enabled=False)
+    entry = to_openai_format(tool)
+    assert entry is to_openai_format(get_all_tools()["read_file"])
+    assert entry["function"]["name"] == "read_file"
+    assert entry["function"]["parameters"] is tool["parameters"]
+
+    mcp_tool = {**tool, "source": "mcp:files", "description": "remote"}
+    assert to_openai_format(mcp_tool)["function"]["description"] == "remote"
+
+
+def test_search_scores_and_filters_by_source():
+    """Search ranks name matches above description matches and honours source."""
+    from src.routes.tools import search_tools
+
+    tools = {
+        "read_file": {"name": "read_file", "description": "Read a file", "source": "builtin"},
+        "fetch_page": {"name": "fetch_page", "description": "Fetch a page and read it", "source": "builtin"},
+        "mcp_read": {"name": "mcp_read", "description": "Remote", "source": "mcp:docs"},
+    }
+    with patch("src.routes.tools.get_all_tools_with_state", return_value=tools):
+        found = asyncio.run(search_tools(query="Read"))
+        builtin = asyncio.run(search_tools(query="read", source="builtin"))
+
+    assert [(t["name"], t["score"]) for t in found["tools"]] == [
+        ("read_file", 60), ("mcp_read", 50), ("fetch_page", 10)
+    ]
+    assert [t["name"] for t in builtin["tools"]] == ["read_file", "fetch_page"]
+
+
+def test_tool_schemas_are_consistent():
+    """Each schema is keyed by its own name and only requires declared properties."""
+    for key, tool in get_all_tools().items():
+        params = tool["parameters"]
+        assert tool["name"] == key
+        assert params["type"] == "object", key
+        assert schema_problems(tool) == [], key
+        assert all("type" in prop for prop in params["properties"].values()), key
+
+
+def test_schema_problems_reports_drift():
+    """Undeclared required fields and duplicate enum values are reported."""
+    tool = {"parameters": {
+        "type": "object",
+        "properties": {"action": {"type": "string", "enum": ["read", "read"]}},
+        "required": ["action", "path"],
+    }}
+    assert schema_problems(tool) == [
+        "required but not declared: ['path']",
+        "duplicate enum values in action",
+    ]
@@ -20,16 +20,15 @@ from telethon import TelegramClient
 from telethon.sessions import StringSession
 
 
+# Secrets directories that exist, looked up once (running from userbot/ or project root;
+# ../secrets relative to the cwd is the same as SCRIPT_DIR/../secrets after the chdir above)
+SECRETS_DIRS = [d for d in (SCRIPT_DIR.parent / 'secrets', SCRIPT_DIR / 'secrets') if d.is_dir()]
+
+
 def get_secret(name, prompt):
     """Read from secrets or ask interactively"""
-    # Try multiple paths (running from userbot/ or project root)
-    paths = [
-        SCRIPT_DIR / '..' / 'secrets' / f'{name}.txt',  # ../secrets/
-        SCRIPT_DIR / 'secrets' / f'{name}.txt',          # ./secrets/
-        Path(f'../secrets/{name}.txt'),                   # relative ../secrets/
-    ]
-    
-    for path in paths:
+    for secrets_dir in SECRETS_DIRS:
+        path = secrets_dir / f'{name}.txt'
         if path.exists():
             value = path.read_text().strip()
             if value:
@@ -42,19 +41,19 @@ async def main():
     """Main authorization flow with proper async context"""
     from telethon.errors import FloodWaitError
 
-print("=" * 50)
-print("Telegram Userbot Authorization")
-print("=" * 50)
-print()
+    print("=" * 50)
+    print("Telegram Userbot Authorization")
+    print("=" * 50)
+    print()
 
-api_id = get_secret('telegram_api_id', 'API ID')
-api_hash = get_secret('telegram_api_hash', 'API Hash')
-phone = get_secret('telegram_phone', 'Phone (with country code, e.g. +79001234567)')
+    api_id = get_secret('telegram_api_id', 'API ID')
+    api_hash = get_secret('telegram_api_hash', 'API Hash')
+    phone = get_secret('telegram_phone', 'Phone (with country code, e.g. +79001234567)')
 
-print()
-print(f"API ID: {api_id}")
-print(f"Phone: {phone}")
-print()
+    print()
+    print(f"API ID: {api_id}")
+    print(f"Phone: {phone}")
+    print()
 
     # Create session directory in the correct location (userbot/session/)
     session_dir = SCRIPT_DIR / 'session'
@@ -68,6 +67,15 @@ print()
     client = TelegramClient(str(session_path), int(api_id), api_hash)
     
     try:
+        # Existing valid session: nothing to do, skip the login round-trips
+        await client.connect()
+        if await client.is_user_authorized():
+            me = await client.get_me()
+            print(f"✅ Already authorized as @{me.username} ({me.id})")
+            print(f"Session: {session_path}.session")
+            await client.disconnect()
+            return
+        
         await client.start(phone=phone)
     except FloodWaitError as e:
         print(f"\n⚠️ FloodWait: Need to wait {e.seconds} seconds")
@@ -94,7 +102,7 @@ if __name__ == "__main__":
     # Python 3.10+ compatible way to run async main
     # Works on Python 3.14 where asyncio.run() requires explicit loop policy
     try:
-asyncio.run(main())
+        asyncio.run(main())
     except RuntimeError as e:
         if "no current event loop" in str(e).lower():
             # Fallback for Python 3.14+ on some systems
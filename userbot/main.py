@@ -10,23 +10,48 @@ import asyncio
 import aiohttp
 import random
 import json
+import orjson
 import time
-from datetime import datetime, timedelta
+from collections import OrderedDict
 from telethon import TelegramClient, events
 from telethon.tl.types import User, Chat, Channel
 from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 import uvicorn
+import uvloop
 
 load_dotenv()
 
 # ============ FASTAPI APP ============
-app = FastAPI(title="Userbot API", description="Telegram userbot capabilities as HTTP API")
+# Internal API (called by core only): no OpenAPI schema or docs routes
+app = FastAPI(
+    title="Userbot API",
+    description="Telegram userbot capabilities as HTTP API",
+    default_response_class=ORJSONResponse,
+    docs_url=None,
+    redoc_url=None,
+    openapi_url=None
+)
 
 # Global client (initialized in main)
 telegram_client: TelegramClient | None = None
 
+# Shared HTTP session for core/proxy calls (keeps connections alive between messages)
+http_session: aiohttp.ClientSession | None = None
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """Return the shared aiohttp session, creating it on first use"""
+    global http_session
+    if http_session is None or http_session.closed:
+        http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=100, keepalive_timeout=60, ttl_dns_cache=300),
+            json_serialize=lambda obj: orjson.dumps(obj).decode()
+        )
+    return http_session
+
 def read_secret(name: str, env_key: str) -> str:
     """Read from Docker Secret or env fallback"""
     paths = [f'/run/secrets/{name}', f'/run/secrets/{name}.txt']
@@ -77,39 +102,41 @@ async def fetch_config():
         return _config_cache["data"]
     
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                f"{CORE_URL}/api/admin/userbot/config",
-                timeout=aiohttp.ClientTimeout(total=5)
-            ) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    _config_cache["data"] = data
-                    _config_cache["last_fetch"] = now
-                    
-                    # Update globals
-                    RESPONSE_CHANCE_DM = data.get("response_chance_dm", 0.6)
-                    RESPONSE_CHANCE_GROUP = data.get("response_chance_group", 0.1)
-                    RESPONSE_CHANCE_MENTION = data.get("response_chance_mention", 0.5)
-                    RESPONSE_CHANCE_REPLY = data.get("response_chance_reply", 0.4)
-                    COOLDOWN_SECONDS = data.get("cooldown_seconds", 60)
-                    IGNORE_BOTS = data.get("ignore_bots", True)
-                    USE_CLASSIFIER = data.get("use_classifier", False)
-                    CLASSIFIER_MIN_CONFIDENCE = data.get("classifier_min_confidence", 0.6)
-                    
-                    return data
+        async with get_http_session().get(
+            f"{CORE_URL}/api/admin/userbot/config",
+            timeout=aiohttp.ClientTimeout(total=5)
+        ) as resp:
+            if resp.status == 200:
+                data = await resp.json(loads=orjson.loads)
+                _config_cache["data"] = data
+                _config_cache["last_fetch"] = now
+                
+                # Update globals
+                RESPONSE_CHANCE_DM = data.get("response_chance_dm", 0.6)
+                RESPONSE_CHANCE_GROUP = data.get("response_chance_group", 0.1)
+                RESPONSE_CHANCE_MENTION = data.get("response_chance_mention", 0.5)
+                RESPONSE_CHANCE_REPLY = data.get("response_chance_reply", 0.4)
+                COOLDOWN_SECONDS = data.get("cooldown_seconds", 60)
+                IGNORE_BOTS = data.get("ignore_bots", True)
+                USE_CLASSIFIER = data.get("use_classifier", False)
+                CLASSIFIER_MIN_CONFIDENCE = data.get("classifier_min_confidence", 0.6)
+                
+                return data
     except Exception as e:
         print(f"[config] Failed to fetch config: {e}")
     
     return _config_cache["data"]
 
+def parse_ids(raw: str) -> frozenset[int]:
+    """Comma-separated Telegram IDs (chat IDs may be negative)"""
+    return frozenset(int(x) for x in (x.strip() for x in raw.split(',')) if x.lstrip('-').isdigit())
+
 # Chats to monitor (empty = all chats)
-ALLOWED_CHATS = []  # Add chat IDs to limit, e.g. [-1001234567890]
-IGNORED_CHATS = []  # Add chat IDs to ignore
+ALLOWED_CHATS: frozenset[int] = frozenset()  # Add chat IDs to limit, e.g. frozenset({-1001234567890})
+IGNORED_CHATS: frozenset[int] = frozenset()  # Add chat IDs to ignore
 
 # Owner IDs (can send direct commands like /stop) - comma-separated list
-_owner_ids_raw = os.getenv('OWNER_ID', '0')
-OWNER_IDS = set(int(x.strip()) for x in _owner_ids_raw.split(',') if x.strip().isdigit())
+OWNER_IDS = parse_ids(os.getenv('OWNER_ID', '0'))
 
 # NOTE: Access control (allowlist, public, admin_only) is managed via admin panel
 # Old OWNER_ONLY and WHITELIST removed - single source of truth in core API
@@ -118,37 +145,69 @@ OWNER_IDS = set(int(x.strip()) for x in _owner_ids_raw.split(',') if x.strip().i
 # Userbot no longer has its own prompt - edit via admin panel
 
 # ============ STATE ============
-last_response_time = {}  # chat_id -> timestamp
+# Per-chat state is kept for the MAX_TRACKED_CHATS most recently active chats (see remember())
+MAX_TRACKED_CHATS = 4096
+last_response_time: OrderedDict[int, float] = OrderedDict()  # chat_id -> time.monotonic() of last reply
 my_user_id = None
 my_username = None
+my_mention = ""  # "@username" lowercased, set once in main()
+chat_names: OrderedDict[int, str] = OrderedDict()  # chat_id -> display name for logs
+entity_cache: OrderedDict[str, tuple] = OrderedDict()  # target (lowercase) -> (entity, expires_at monotonic)
+_entity_lookups: dict[str, asyncio.Future] = {}  # in-flight get_entity calls
+ENTITY_CACHE_TTL = 300  # Seconds
 
 # Message history for classifier context (per chat)
-message_history: dict[int, list[dict]] = {}  # chat_id -> list of {author, text, timestamp}
+message_history: OrderedDict[int, list[dict]] = OrderedDict()  # chat_id -> list of {author, text, timestamp}
 MAX_HISTORY_PER_CHAT = 15
 
 # Anti-loop: track bot-to-bot conversations
-bot_conversation_count: dict[tuple[int, int], int] = {}  # (chat_id, bot_id) -> count
-bot_conversation_reset: dict[tuple[int, int], float] = {}  # (chat_id, bot_id) -> timestamp
+bot_conversation_count: OrderedDict[tuple[int, int], int] = OrderedDict()  # (chat_id, bot_id) -> count
+bot_conversation_reset: OrderedDict[tuple[int, int], float] = OrderedDict()  # (chat_id, bot_id) -> time.monotonic()
 TELEGRAM_BOT_ID = 8572582989  # @localtopshbot
 MAX_BOT_REPLIES = 3  # Max replies to bot per chat before cooldown
 BOT_COOLDOWN = 120  # Seconds
 
+# Keywords that increase response chance, matched in one case-insensitive pass
+INTERESTING_KEYWORDS = ('помоги', 'подскажи', 'как ', 'что ', 'почему', 'зачем',
+                        'help', 'how', 'what', 'why', 'can you', 'please',
+                        'код', 'ошибка', 'error', 'bug', 'python', 'javascript')
+_KEYWORD_RE = re.compile("|".join(map(re.escape, INTERESTING_KEYWORDS)), re.IGNORECASE)
+
+# Agent response parsing: [CMD:name:arg] commands and model artifacts to strip
+_CMD_RE = re.compile(r'\[CMD:(\w+):([^\]]+)\]')
+# Status prefixes of command results (a reply made only of these isn't sent)
+_CMD_RESULT_PREFIXES = ('✅', '❌')
+# Characters Telethon's Markdown parser acts on; plain replies skip the parser
+_MARKDOWN_RE = re.compile(r'[*_~`|\[]')
+# Thinking blocks (with content) and standalone tags are stripped in a single scan
+_ARTIFACT_RE = re.compile(
+    r'<thinking>[\s\S]*?</thinking>|</?(?:final|response|answer|output|reply|thinking)>',
+    re.IGNORECASE
+)
+
 # ============ HELPERS ============
 
+def remember(store: OrderedDict, key, value):
+    """Set store[key] as the most recent entry, dropping the oldest past MAX_TRACKED_CHATS"""
+    store[key] = value
+    store.move_to_end(key)
+    if len(store) > MAX_TRACKED_CHATS:
+        store.popitem(last=False)
+
+
 def add_to_history(chat_id: int, author: str, text: str):
     """Add message to chat history for classifier context"""
-    if chat_id not in message_history:
-        message_history[chat_id] = []
-    
-    message_history[chat_id].append({
+    history = message_history.get(chat_id, [])
+    history.append({
         "author": author,
         "text": text[:500],  # Truncate long messages
         "timestamp": time.time()
     })
     
     # Keep only last N messages
-    if len(message_history[chat_id]) > MAX_HISTORY_PER_CHAT:
-        message_history[chat_id] = message_history[chat_id][-MAX_HISTORY_PER_CHAT:]
+    if len(history) > MAX_HISTORY_PER_CHAT:
+        history = history[-MAX_HISTORY_PER_CHAT:]
+    remember(message_history, chat_id, history)
 
 
 async def call_classifier(
@@ -179,27 +238,26 @@ async def call_classifier(
             "is_mention": is_mention
         }
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"{PROXY_URL}/classify",
-                json=payload,
-                timeout=aiohttp.ClientTimeout(total=8)  # Fast timeout
-            ) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    should = data.get("should_respond", False)
-                    confidence = data.get("confidence", 0.5)
-                    reason = data.get("reason", "classifier")
-                    
-                    # Check if fallback was used
-                    if data.get("fallback"):
-                        reason = f"[fallback] {reason}"
-                    
-                    return should, confidence, reason
-                else:
-                    print(f"[classifier] HTTP {resp.status}")
-                    return is_mention or is_reply_to_bot, 0.5, "classifier HTTP error"
-                    
+        async with get_http_session().post(
+            f"{PROXY_URL}/classify",
+            json=payload,
+            timeout=aiohttp.ClientTimeout(total=8)  # Fast timeout
+        ) as resp:
+            if resp.status == 200:
+                data = await resp.json(loads=orjson.loads)
+                should = data.get("should_respond", False)
+                confidence = data.get("confidence", 0.5)
+                reason = data.get("reason", "classifier")
+                
+                # Check if fallback was used
+                if data.get("fallback"):
+                    reason = f"[fallback] {reason}"
+                
+                return should, confidence, reason
+            else:
+                print(f"[classifier] HTTP {resp.status}")
+                return is_mention or is_reply_to_bot, 0.5, "classifier HTTP error"
+                
     except asyncio.TimeoutError:
         print("[classifier] Timeout, using fallback")
         return is_mention or is_reply_to_bot, 0.5, "classifier timeout"
@@ -215,9 +273,6 @@ async def should_respond(event, message_text: str) -> tuple[bool, str]:
     """
     global my_user_id, my_username
     
-    # Fetch latest config from admin panel
-    await fetch_config()
-    
     chat_id = event.chat_id
     sender_id = event.sender_id
     
@@ -240,16 +295,18 @@ async def should_respond(event, message_text: str) -> tuple[bool, str]:
     if len(message_text.strip()) < MIN_MESSAGE_LENGTH:
         return False, "too short"
     
+    # Fetch latest config from admin panel (only needed past the static checks above)
+    await fetch_config()
+    
     # Check cooldown
-    now = datetime.now()
     if chat_id in last_response_time:
-        elapsed = (now - last_response_time[chat_id]).total_seconds()
+        elapsed = time.monotonic() - last_response_time[chat_id]
         if elapsed < COOLDOWN_SECONDS:
             return False, f"cooldown ({int(COOLDOWN_SECONDS - elapsed)}s left)"
     
     # Determine chat type and base chance
     is_dm = event.is_private
-    is_mentioned = my_username and f"@{my_username.lower()}" in message_text.lower()
+    is_mentioned = bool(my_mention) and my_mention in message_text.lower()
     is_reply_to_me = event.is_reply and event.reply_to_msg_id  # Will check if reply to our msg
     is_forwarded = hasattr(event.message, 'fwd_from') and event.message.fwd_from is not None
     
@@ -272,15 +329,10 @@ async def should_respond(event, message_text: str) -> tuple[bool, str]:
         reason = "group message"
     
     # Keywords that increase response chance
-    interesting_keywords = ['помоги', 'подскажи', 'как ', 'что ', 'почему', 'зачем', 
-                           'help', 'how', 'what', 'why', 'can you', 'please',
-                           'код', 'ошибка', 'error', 'bug', 'python', 'javascript']
-    
-    for kw in interesting_keywords:
-        if kw in message_text.lower():
-            chance = min(chance + 0.2, 0.95)
-            reason += f" +keyword({kw})"
-            break
+    keyword = _KEYWORD_RE.search(message_text)
+    if keyword:
+        chance = min(chance + 0.2, 0.95)
+        reason += f" +keyword({keyword.group().lower()})"
     
     # Use classifier if enabled
     if USE_CLASSIFIER:
@@ -325,35 +377,57 @@ async def call_agent(
 ) -> AgentResponse:
     """Call gateway API to get agent response"""
     try:
-        async with aiohttp.ClientSession() as session:
-            payload = {
-                "user_id": user_id,
-                "chat_id": chat_id,
-                "message": message,
-                "username": username,
-                "source": "userbot",
-                "chat_type": chat_type,
-            }
-            
-            async with session.post(
-                f"{CORE_URL}/api/chat",
-                json=payload,
-                timeout=aiohttp.ClientTimeout(total=120)
-            ) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    return AgentResponse(
-                        response=data.get("response"),
-                        disabled=data.get("disabled", False),
-                        access_denied=data.get("access_denied", False)
-                    )
-                else:
-                    print(f"[agent] Error: {resp.status}")
-                    return AgentResponse(None)
+        payload = {
+            "user_id": user_id,
+            "chat_id": chat_id,
+            "message": message,
+            "username": username,
+            "source": "userbot",
+            "chat_type": chat_type,
+        }
+        
+        async with get_http_session().post(
+            f"{CORE_URL}/api/chat",
+            json=payload,
+            timeout=aiohttp.ClientTimeout(total=120)
+        ) as resp:
+            if resp.status == 200:
+                data = await resp.json(loads=orjson.loads)
+                return AgentResponse(
+                    response=data.get("response"),
+                    disabled=data.get("disabled", False),
+                    access_denied=data.get("access_denied", False)
+                )
+            else:
+                print(f"[agent] Error: {resp.status}")
+                return AgentResponse(None)
     except Exception as e:
         print(f"[agent] Request failed: {e}")
         return AgentResponse(None)
 
+async def _resolve_entity(client, target, key: str):
+    entity = await client.get_entity(target)
+    remember(entity_cache, key, (entity, time.monotonic() + ENTITY_CACHE_TTL))
+    return entity
+
+
+async def get_entity_cached(client, target):
+    """client.get_entity with a TTL cache; concurrent lookups of one target share a single RPC
+    
+    Resolving a username is a ResolveUsername RPC every time otherwise.
+    """
+    key = str(target).lower()
+    cached = entity_cache.get(key)
+    if cached and cached[1] > time.monotonic():
+        return cached[0]
+    lookup = _entity_lookups.get(key)
+    if lookup is None:
+        lookup = asyncio.ensure_future(_resolve_entity(client, target, key))
+        _entity_lookups[key] = lookup
+        lookup.add_done_callback(lambda _: _entity_lookups.pop(key, None))
+    # Shielded: one caller going away must not cancel the lookup for the others
+    return await asyncio.shield(lookup)
+
 # ============ USERBOT ACTIONS ============
 # These can be called by agent through special commands in response
 
@@ -378,7 +452,7 @@ async def join_chat(client, invite_link: str) -> str:
 async def send_message_to(client, target: str, message: str) -> str:
     """Send message to any user/chat"""
     try:
-        entity = await client.get_entity(target)
+        entity = await get_entity_cached(client, target)
         await client.send_message(entity, message)
         return f"✅ Sent to {target}"
     except Exception as e:
@@ -389,7 +463,8 @@ async def get_chat_history(client, chat_id: int, limit: int = 20) -> str:
     try:
         messages = []
         async for msg in client.iter_messages(chat_id, limit=limit):
-            sender = await msg.get_sender()
+            # Filled from the users/chats returned with the history - no extra RPC per message
+            sender = msg.sender
             name = getattr(sender, 'username', None) or getattr(sender, 'first_name', 'Unknown')
             text = msg.text or '[media]'
             # Include message ID for delete/edit
@@ -441,7 +516,7 @@ async def read_channel(client, channel: str, limit: int = 5) -> str:
             channel_name = channel
             channel = f'@{channel}'
         
-        entity = await client.get_entity(channel)
+        entity = await get_entity_cached(client, channel)
         posts = []
         
         async for msg in client.iter_messages(entity, limit=limit * 2):  # Get more to skip media-only
@@ -504,13 +579,12 @@ async def process_command(client, response: str) -> str | None:
     if not response:
         return response
     
-    # Parse commands like: [CMD:join:https://t.me/group]
-    import re
-    
-    cmd_pattern = r'\[CMD:(\w+):([^\]]+)\]'
-    matches = re.findall(cmd_pattern, response)
-    
-    for cmd, arg in matches:
+    # Parse commands like: [CMD:join:https://t.me/group] and splice each
+    # result in place of its command in a single pass over the response
+    pieces = []
+    pos = 0
+    for match in _CMD_RE.finditer(response):
+        cmd, arg = match.groups()
         result = ""
         if cmd == "join":
             result = await join_chat(client, arg)
@@ -536,9 +610,57 @@ async def process_command(client, response: str) -> str | None:
             print(f"[channel] Read {channel}: {len(result)} chars")
         
         # Replace command with result
-        response = response.replace(f"[CMD:{cmd}:{arg}]", result)
+        pieces.append(response[pos:match.start()])
+        pieces.append(result)
+        pos = match.end()
     
-    return response
+    if not pieces:
+        return response
+    pieces.append(response[pos:])
+    return "".join(pieces)
+
+# ============ OWNER COMMANDS ============
+# Direct commands from owner (bypass agent): handler(client, event, arg)
+
+async def _cmd_join(client, event, arg: str):
+    await event.reply(await join_chat(client, arg))
+
+async def _cmd_send(client, event, arg: str):
+    # /send @username message
+    p = arg.split(maxsplit=1)
+    if len(p) == 2:
+        await event.reply(await send_message_to(client, p[0], p[1]))
+
+async def _cmd_history(client, event, arg: str):
+    chat_id = int(arg) if arg else event.chat_id
+    await event.reply(await get_chat_history(client, chat_id))
+
+async def _cmd_dialogs(client, event, arg: str):
+    await event.reply(await list_dialogs(client, int(arg) if arg.isdigit() else 20))
+
+async def _cmd_stats(client, event, arg: str):
+    await event.reply(f"📊 Userbot Stats\n\nActive cooldowns: {len(last_response_time)}\nOwners: {OWNER_IDS}")
+
+async def _cmd_help(client, event, arg: str):
+    await event.reply("""🤖 Userbot Commands:
+
+/join <link> - Join group/channel
+/send <user> <msg> - Send message to user
+/history [chat_id] - Get chat history
+/dialogs [limit] - List recent chats
+/stats - Show stats
+/help - This message
+
+📝 Access control managed via admin panel""")
+
+OWNER_COMMANDS = {
+    "/join": _cmd_join,
+    "/send": _cmd_send,
+    "/history": _cmd_history,
+    "/dialogs": _cmd_dialogs,
+    "/stats": _cmd_stats,
+    "/help": _cmd_help,
+}
 
 # ============ API MODELS ============
 
@@ -593,7 +715,7 @@ async def api_resolve_username(username: str):
         # Handle with or without @
         if not username.startswith('@'):
             username = f'@{username}'
-        entity = await telegram_client.get_entity(username)
+        entity = await get_entity_cached(telegram_client, username)
         return {
             "success": True,
             "id": entity.id,
@@ -671,41 +793,35 @@ async def api_send_file(req: SendFileRequest):
         raise HTTPException(503, "Telegram client not ready")
     
     import base64
-    import tempfile
+    import io
     
     try:
-        # Decode base64 file
-        file_bytes = base64.b64decode(req.file_data)
+        # Decode base64 off the event loop (files can be large)
+        file_bytes = await asyncio.to_thread(base64.b64decode, req.file_data)
         
-        # Create temp file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=f"_{req.filename}") as tmp:
-            tmp.write(file_bytes)
-            tmp_path = tmp.name
+        # Upload straight from memory; Telethon takes the filename from .name
+        file = io.BytesIO(file_bytes)
+        file.name = req.filename
         
-        try:
-            # Get entity
-            entity = await telegram_client.get_entity(req.target)
-            
-            # Send file
-            await telegram_client.send_file(
-                entity,
-                tmp_path,
-                caption=req.caption or None,
-                force_document=True  # Send as document, not media
-            )
-            
-            return {"success": True, "message": f"✅ File {req.filename} sent to {req.target}"}
-        finally:
-            # Cleanup temp file
-            os.unlink(tmp_path)
-            
+        # Get entity
+        entity = await get_entity_cached(telegram_client, req.target)
+        
+        # Send file
+        await telegram_client.send_file(
+            entity,
+            file,
+            caption=req.caption or None,
+            force_document=True  # Send as document, not media
+        )
+        
+        return {"success": True, "message": f"✅ File {req.filename} sent to {req.target}"}
     except Exception as e:
         return {"success": False, "message": f"❌ Failed to send file: {e}"}
 
 # ============ MAIN ============
 
 async def main():
-    global my_user_id, my_username, telegram_client
+    global my_user_id, my_username, my_mention, telegram_client
     global telegram_client  # Needed for API endpoints
     
     if not API_ID or not API_HASH:
@@ -734,6 +850,7 @@ async def main():
     me = await client.get_me()
     my_user_id = me.id
     my_username = me.username
+    my_mention = f"@{my_username.lower()}" if my_username else ""
     
     # Set global client for API endpoints
     telegram_client = client
@@ -772,21 +889,23 @@ async def main():
             else:
                 fwd_info = " [forwarded]"
         
-        # Log ALL incoming messages
-        chat = await event.get_chat()
-        chat_name = getattr(chat, 'title', None) or getattr(chat, 'username', None) or str(event.chat_id)
+        # Log ALL incoming messages (chat names are only for logs, resolve each chat once)
+        chat_name = chat_names.get(event.chat_id)
+        if chat_name is None:
+            chat = await event.get_chat()
+            chat_name = getattr(chat, 'title', None) or getattr(chat, 'username', None) or str(event.chat_id)
+            remember(chat_names, event.chat_id, chat_name)
         print(f"[msg] {chat_name}: {text[:50]}...{fwd_info}")
         
         # Add to history for classifier context
-        sender = await event.get_sender()
+        # Usually already filled from the update's entities; fetch only when it isn't
+        sender = event.sender or await event.get_sender()
         sender_name = getattr(sender, 'username', None) or getattr(sender, 'first_name', 'anon') if sender else 'unknown'
         add_to_history(event.chat_id, sender_name, text)
         
         if not text:
             return
         
-        # Get sender info
-        sender = await event.get_sender()
         if not sender:
             print(f"[msg] No sender info")
             return
@@ -798,42 +917,9 @@ async def main():
             cmd = parts[0].lower()
             arg = parts[1] if len(parts) > 1 else ""
             
-            if cmd == '/join':
-                result = await join_chat(client, arg)
-                await event.reply(result)
-                return
-            elif cmd == '/send':
-                # /send @username message
-                p = arg.split(maxsplit=1)
-                if len(p) == 2:
-                    result = await send_message_to(client, p[0], p[1])
-                    await event.reply(result)
-                return
-            elif cmd == '/history':
-                chat_id = int(arg) if arg else event.chat_id
-                result = await get_chat_history(client, chat_id)
-                await event.reply(result)
-                return
-            elif cmd == '/dialogs':
-                result = await list_dialogs(client, int(arg) if arg.isdigit() else 20)
-                await event.reply(result)
-                return
-            elif cmd == '/stats':
-                stats = f"📊 Userbot Stats\n\nActive cooldowns: {len(last_response_time)}\nOwners: {OWNER_IDS}"
-                await event.reply(stats)
-                return
-            elif cmd == '/help':
-                help_text = """🤖 Userbot Commands:
-
-/join <link> - Join group/channel
-/send <user> <msg> - Send message to user
-/history [chat_id] - Get chat history
-/dialogs [limit] - List recent chats
-/stats - Show stats
-/help - This message
-
-📝 Access control managed via admin panel"""
-                await event.reply(help_text)
+            command = OWNER_COMMANDS.get(cmd)
+            if command:
+                await command(client, event, arg)
                 return
             
         # Ignore bots (use current config value)
@@ -845,9 +931,10 @@ async def main():
         
         sender_name = getattr(sender, 'username', None) or getattr(sender, 'first_name', 'anon')
         chat_id = event.chat_id
+        is_private = event.is_private
         
         # Determine chat type
-        chat_type = "private" if event.is_private else "group"
+        chat_type = "private" if is_private else "group"
         
         # Decide if we should respond
         should, reason = await should_respond(event, text)
@@ -859,39 +946,39 @@ async def main():
             return
         
         # Anti-loop: limit bot-to-bot conversation
-        if sender.id == TELEGRAM_BOT_ID and not event.is_private:
-            import time
+        if sender.id == TELEGRAM_BOT_ID and not is_private:
             key = (chat_id, sender.id)
-            now = time.time()
+            now = time.monotonic()
             
             # Reset counter if cooldown passed
-            last_reset = bot_conversation_reset.get(key, 0)
+            last_reset = bot_conversation_reset.get(key, float("-inf"))
             if now - last_reset > BOT_COOLDOWN:
-                bot_conversation_count[key] = 0
-                bot_conversation_reset[key] = now
+                remember(bot_conversation_count, key, 0)
+                remember(bot_conversation_reset, key, now)
             
             count = bot_conversation_count.get(key, 0)
             if count >= MAX_BOT_REPLIES:
                 print(f"[anti-loop] Ignoring bot in {chat_id} (count={count})")
                 return
             
-            bot_conversation_count[key] = count + 1
+            remember(bot_conversation_count, key, count + 1)
         
         print(f"[respond] {sender_name} in {chat_id}: {text[:100]}...")
         print(f"[respond] Reason: {reason}")
         
         # Show typing
         async with client.action(chat_id, 'typing'):
-            # Small delay to feel human
-            await asyncio.sleep(random.uniform(1, 3))
-            
-            # Call agent
-            agent_result = await call_agent(
-                user_id=sender.id,
-                chat_id=chat_id,
-                message=text,
-                username=sender_name,
-                chat_type=chat_type
+            # Call agent; the small "feel human" delay runs alongside it, so it
+            # only adds latency when the agent answers in under 1-3s
+            _, agent_result = await asyncio.gather(
+                asyncio.sleep(random.uniform(1, 3)),
+                call_agent(
+                    user_id=sender.id,
+                    chat_id=chat_id,
+                    message=text,
+                    username=sender_name,
+                    chat_type=chat_type
+                )
             )
         
         # Check if userbot is disabled
@@ -905,43 +992,60 @@ async def main():
             return
         
         response = agent_result.response
-        if response:
-            # Process any special commands in response
+        if not response:
+            print(f"[error] No response from agent")
+            return
+        
+        # Process any special commands in response ([CMD:name:arg])
+        if '[CMD:' in response:
             response = await process_command(client, response)
-            
-            # Update cooldown
-            last_response_time[chat_id] = datetime.now()
-            
-            # Send response - clean model artifacts
-            if response:
-                # Remove thinking blocks with content
-                response = re.sub(r'<thinking>[\s\S]*?</thinking>', '', response, flags=re.IGNORECASE)
-                # Remove standalone tags
-                response = re.sub(r'</?(final|response|answer|output|reply|thinking)>', '', response, flags=re.IGNORECASE).strip()
-            # Don't send if response is just command results
-            if response and not response.startswith('✅') and not response.startswith('❌'):
-                # Random reply (50% in DM, always in groups)
-                use_reply = not event.is_private or random.random() < 0.5
-                
-                if use_reply:
-                    await event.reply(response)
-                else:
-                    await client.send_message(chat_id, response)
-                
-                print(f"[sent] {'(reply) ' if use_reply else ''}{response[:100]}...")
+        
+        # Update cooldown
+        remember(last_response_time, chat_id, time.monotonic())
+        
+        # Send response - clean model artifacts
+        if response:
+            # Remove thinking blocks with content and standalone tags
+            # (most responses have no tags at all, so skip the regex then)
+            if '<' in response:
+                response = _ARTIFACT_RE.sub('', response)
+            response = response.strip()
+        # Don't send if response is just command results
+        if not response or response.startswith(_CMD_RESULT_PREFIXES):
+            return
+        
+        # Random reply (50% in DM, always in groups)
+        use_reply = not is_private or bool(random.getrandbits(1))
+        
+        parse_mode = 'md' if _MARKDOWN_RE.search(response) else None
+        
+        if use_reply:
+            await event.reply(response, parse_mode=parse_mode)
         else:
-            print(f"[error] No response from agent")
+            await client.send_message(chat_id, response, parse_mode=parse_mode)
+        
+        print(f"[sent] {'(reply) ' if use_reply else ''}{response[:100]}...")
     
     print("[userbot] Listening for messages...")
     
     # Run uvicorn and telethon client in parallel
-    config = uvicorn.Config(app, host="0.0.0.0", port=8080, log_level="warning")
+    # httptools parser; the loop is already uvloop (installed in __main__)
+    config = uvicorn.Config(
+        app, host="0.0.0.0", port=8080, log_level="warning",
+        http="httptools", access_log=False, server_header=False, date_header=False
+    )
     server = uvicorn.Server(config)
     
-    await asyncio.gather(
-        client.run_until_disconnected(),
-        server.serve()
-    )
+    try:
+        # If either side fails, the TaskGroup cancels the other
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(client.run_until_disconnected())
+            tg.create_task(server.serve())
+    finally:
+        if http_session:
+            await http_session.close()
 
 if __name__ == '__main__':
+    # libuv event loop for both Telethon and the API server
+    uvloop.install()
     asyncio.run(main())